@@ -11,10 +11,7 @@ import time
 import yaml
 from pathlib import Path
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from theological_indexer import TheologicalIndexer
+from src.theological_indexer import TheologicalIndexer
 
 def load_config():
     """Load configuration from YAML file"""
@@ -71,11 +68,11 @@ def main():
         
         # Rebuild index
         print("\nRebuilding theological concept index...")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         success = indexer.rebuild_index_for_all_documents()
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         
         if success:
@@ -11,9 +11,6 @@ import logging
 import sqlite3
 from pathlib import Path
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.initialize_database import initialize_database
 
 def setup_logging():
@@ -13,9 +13,6 @@ import logging
 import argparse
 from datetime import datetime
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.initialize_database import initialize_database
 from src.document_processor import DocumentProcessor
 from src.theological_indexer import TheologicalIndexer
@@ -232,7 +229,10 @@ def main():
         new_document_ids = get_new_documents_for_indexing(db_manager, documents_dir)
         
         # Process all documents
-        doc_processor.process_directory(documents_dir)
+        try:
+            doc_processor.process_directory(documents_dir)
+        finally:
+            doc_processor.close()
         
         # Get final stats
         final_stats = db_manager.get_database_stats()
@@ -4,15 +4,11 @@ Document Database Terminal Query Interface
 Multi-database support for terminal-based queries
 """
 
-import os
 import sys
 import argparse
 import click
 from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.database_config import add_database_args, handle_database_selection, get_database_config, DatabaseConfig
 from src.terminal_interface import TerminalInterface
 
@@ -20,10 +16,10 @@ from src.terminal_interface import TerminalInterface
 class MultiDatabaseTerminalInterface(TerminalInterface):
     """Extended terminal interface with multi-database support"""
     
-    def __init__(self, db_id=None, auto_save=True, use_ai=True):
+    def __init__(self, db_id=None, auto_save=True, use_ai=True, interactive=True):
         self.db_id = db_id
         self.database_name = None
-        super().__init__(auto_save=auto_save, use_ai=use_ai)
+        super().__init__(auto_save=auto_save, use_ai=use_ai, interactive=interactive)
     
     def _load_config(self):
         """Load database-specific configuration"""
@@ -152,7 +148,8 @@ def main(query, output, no_ai, no_save, db_id, list_databases):
         interface = MultiDatabaseTerminalInterface(
             db_id=db_id, 
             auto_save=auto_save, 
-            use_ai=use_ai
+            use_ai=use_ai,
+            interactive=not query
         )
         
         if query:
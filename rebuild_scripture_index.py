@@ -7,12 +7,10 @@ Rebuilds the scripture reference index for all documents in the database
 import os
 import sys
 import logging
+import argparse
 from datetime import datetime
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from scripture_indexer import ScriptureIndexer
+from src.scripture_indexer import ScriptureIndexer
 
 def setup_logging():
     """Set up logging configuration"""
@@ -27,6 +25,11 @@ def setup_logging():
 
 def main():
     """Main function to rebuild scripture index"""
+    parser = argparse.ArgumentParser(description='Rebuild the scripture reference index')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-index every document, including ones unchanged since the last rebuild')
+    args = parser.parse_args()
+    
     # Ensure logs directory exists
     os.makedirs('logs', exist_ok=True)
     
@@ -47,7 +50,10 @@ def main():
                    f"Unique references: {stats_before.get('unique_references', 0)}")
         
         # Rebuild the index
-        success = indexer.rebuild_scripture_index_for_all_documents()
+        success = indexer.rebuild_scripture_index_for_all_documents(force=args.force)
+        if indexer.last_rebuild_skipped:
+            logger.info(f"Skipped {indexer.last_rebuild_skipped} documents unchanged since the last rebuild "
+                       f"(use --force to re-index them)")
         
         if success:
             logger.info("Scripture index rebuild completed successfully!")
@@ -5,16 +5,29 @@ A comprehensive document management system using Python and Ollama.
 Supports multiple document formats and provides both terminal and web-based query interfaces.
 """
 
-from .initialize_database import initialize_database
-from .database_manager import DatabaseManager
-from .document_processor import DocumentProcessor
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Document Database System"
 
-# Package-level imports
+# Package-level imports; initialize_database is not among them because the
+# name belongs to the src.initialize_database submodule once it is imported
 __all__ = [
-    'initialize_database',
     'DatabaseManager',
     'DocumentProcessor',
 ]
+
+# Submodules providing the package-level names. They import ChromaDB and the
+# embedding stack, so they load on first access rather than with the package
+_LAZY_IMPORTS = {
+    'DatabaseManager': '.database_manager',
+    'DocumentProcessor': '.document_processor',
+}
+
+def __getattr__(name):
+    """Import package-level names on first access"""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,12 +4,44 @@ Handles multi-database system with database ID routing
 """
 
 import os
+import json
 import yaml
 import logging
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def load_yaml_config(path) -> Dict:
+    """Load a YAML file, via its JSON cache when that is up to date"""
+    cache_path = f"{path}.json"
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)
+    _write_json_cache(cache_path, config)
+    return config
+
+def _write_json_cache(cache_path: str, config: Dict):
+    """Atomically write a parsed YAML file as JSON; failures only cost the cache"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 class DatabaseConfig:
     """Manages configuration for multiple theological databases"""
     
@@ -24,16 +56,14 @@ class DatabaseConfig:
         if not os.path.exists(self.registry_file):
             raise FileNotFoundError(f"Database registry not found: {self.registry_file}")
         
-        with open(self.registry_file, 'r') as f:
-            return yaml.safe_load(f)
+        return load_yaml_config(self.registry_file)
     
     def load_base_config(self) -> Dict:
         """Load the base configuration template"""
         if not os.path.exists(self.base_config_file):
             raise FileNotFoundError(f"Base config not found: {self.base_config_file}")
         
-        with open(self.base_config_file, 'r') as f:
-            return yaml.safe_load(f)
+        return load_yaml_config(self.base_config_file)
     
     def get_database_info(self, db_id: str) -> Optional[Dict]:
         """Get database information by ID"""
@@ -9,14 +9,26 @@ import logging
 import chromadb
 from chromadb.config import Settings
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 import hashlib
 import json
 import ollama
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Number of chunks embedded per vector store insert
+EMBEDDING_MICROBATCH_SIZE = 256
+
+def _normalize_embedding(embedding) -> List[float]:
+    """Scale an embedding to unit length so inner product equals cosine similarity"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return vector.tolist()
+    return (vector / norm).tolist()
+
 class DatabaseManager:
     """Manages both vector database and metadata operations"""
     
@@ -28,6 +40,9 @@ class DatabaseManager:
         self.similarity_threshold = config['embeddings']['similarity_threshold']
         self.batch_size = config['database']['batch_size']
         
+        # (metadata db signature, stats) from the last get_database_stats call
+        self._stats_cache = None
+        
         # Initialize embedding model
         self._init_embedding_model()
         
@@ -79,30 +94,63 @@ class DatabaseManager:
                     model=self.embedding_model_name,
                     prompt=text
                 )
-                return response['embedding']
+                return _normalize_embedding(response['embedding'])
             else:  # sentence-transformers
-                return self.embedding_model.encode(text).tolist()
+                return self.embedding_model.encode(text, normalize_embeddings=True).tolist()
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             # Return a dummy embedding as fallback
             return [0.0] * 384  # Standard embedding dimension
     
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a batch of texts using the configured provider"""
+        if self.embedding_provider == 'ollama':
+            return [self.generate_embedding(text) for text in texts]
+        
+        try:
+            batch_size = self.config['embeddings'].get('batch_size', 32)
+            return self.embedding_model.encode(
+                texts, batch_size=batch_size, normalize_embeddings=True
+            ).tolist()
+        except Exception as e:
+            logger.error(f"Failed to generate batch embeddings: {e}")
+            return [self.generate_embedding(text) for text in texts]
+    
     def _init_vector_database(self):
-        """Initialize ChromaDB vector database"""
+        """Initialize the vector database (ChromaDB by default, FAISS for large collections)"""
+        backend = self.config['database'].get('vector_backend', 'chroma')
+        self._vector_backend = backend
+        
         try:
-            # Create ChromaDB client
-            self.chroma_client = chromadb.PersistentClient(
-                path=self.vector_db_path,
-                settings=Settings(anonymized_telemetry=False)
-            )
+            if backend == 'faiss':
+                from .vector_store import FAISSVectorStore
+                
+                # The metadata database must exist before the FAISS mapping table is created
+                os.makedirs(os.path.dirname(self.metadata_db_path), exist_ok=True)
+                self._vector_store = FAISSVectorStore(
+                    os.path.join(self.vector_db_path, 'faiss.index'),
+                    self.metadata_db_path
+                )
+            else:
+                # Create ChromaDB client
+                self.chroma_client = chromadb.PersistentClient(
+                    path=self.vector_db_path,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                
+                # Create or get collection. Embeddings are unit-normalized, so inner
+                # product ranks identically to cosine without the per-probe norm
+                # division. Existing cosine collections keep their space and still
+                # return the same distances for normalized vectors.
+                self._vector_store = self.chroma_client.get_or_create_collection(
+                    name="documents",
+                    metadata={"hnsw:space": "ip"}
+                )
             
-            # Create or get collection
-            self.collection = self.chroma_client.get_or_create_collection(
-                name="documents",
-                metadata={"hnsw:space": "cosine"}
-            )
+            # Kept for scripts that use the collection directly
+            self.collection = self._vector_store
             
-            logger.info(f"Initialized vector database at {self.vector_db_path}")
+            logger.info(f"Initialized {backend} vector database at {self.vector_db_path}")
             
         except Exception as e:
             logger.error(f"Failed to initialize vector database: {e}")
@@ -118,6 +166,9 @@ class DatabaseManager:
             conn = sqlite3.connect(self.metadata_db_path)
             cursor = conn.cursor()
             
+            # WAL mode is persistent in the database file, so set it once here
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Documents table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS documents (
@@ -134,6 +185,12 @@ class DatabaseManager:
                 )
             ''')
             
+            # Lets joins ordered by filename walk documents in index order
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_documents_filename 
+                ON documents (filename, id)
+            ''')
+            
             # Document chunks table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS document_chunks (
@@ -148,6 +205,12 @@ class DatabaseManager:
                 )
             ''')
             
+            # Reads a document's chunks in order without scanning the whole table
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_document_chunks_order
+                ON document_chunks (document_id, chunk_index)
+            ''')
+            
             # Query history table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS query_history (
@@ -209,6 +272,34 @@ class DatabaseManager:
             logger.error(f"Error checking if document exists: {e}")
             return False
     
+    def get_all_processed_paths(self) -> Set[str]:
+        """Get the file paths of all processed documents"""
+        try:
+            conn = sqlite3.connect(self.metadata_db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT filepath FROM documents")
+            paths = {row[0] for row in cursor.fetchall()}
+            conn.close()
+            return paths
+            
+        except Exception as e:
+            logger.error(f"Error loading processed document paths: {e}")
+            return set()
+    
+    def get_all_processed_hashes(self) -> Set[str]:
+        """Get the file hashes of all processed documents"""
+        try:
+            conn = sqlite3.connect(self.metadata_db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT file_hash FROM documents")
+            hashes = {row[0] for row in cursor.fetchall()}
+            conn.close()
+            return hashes
+            
+        except Exception as e:
+            logger.error(f"Error loading processed document hashes: {e}")
+            return set()
+    
     def is_chunk_duplicate(self, chunk_text: str) -> bool:
         """Check if chunk content already exists in database"""
         try:
@@ -244,60 +335,21 @@ class DatabaseManager:
             file_size = os.path.getsize(filepath)
             modified_date = datetime.fromtimestamp(os.path.getmtime(filepath))
             
-            # Use timeout and WAL mode for better concurrency
+            # Use timeout for better concurrency (WAL mode is set once at init)
             conn = sqlite3.connect(self.metadata_db_path, timeout=30.0)
-            conn.execute('PRAGMA journal_mode=WAL')
-            cursor = conn.cursor()
-            
-            # Insert document
-            cursor.execute('''
-                INSERT INTO documents 
-                (filename, filepath, file_hash, file_size, file_type, modified_date, chunk_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (filename, filepath, file_hash, file_size, file_type, modified_date, len(chunks)))
-            
-            document_id = cursor.lastrowid
-            
-            # Process chunks in batches
-            chunk_data = []
-            embeddings = []
-            vector_ids = []
-            
-            for i, chunk in enumerate(chunks):
-                if self.is_chunk_duplicate(chunk):
-                    # Skipping duplicate chunk
-                    continue
-                
-                chunk_hash = self.calculate_text_hash(chunk)
-                vector_id = f"doc_{document_id}_chunk_{i}"
-                
-                chunk_data.append((document_id, i, chunk, chunk_hash, vector_id))
-                embeddings.append(self.generate_embedding(chunk))
-                vector_ids.append(vector_id)
-            
-            if chunk_data:
-                # Insert chunks into metadata database
-                cursor.executemany('''
-                    INSERT INTO document_chunks 
-                    (document_id, chunk_index, chunk_text, chunk_hash, vector_id)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', chunk_data)
-                
-                # Insert embeddings into vector database
-                self.collection.add(
-                    embeddings=embeddings,
-                    documents=[item[2] for item in chunk_data],  # chunk_text
-                    ids=vector_ids,
-                    metadatas=[{
-                        "document_id": item[0],
-                        "chunk_index": item[1],
-                        "filename": filename,
-                        "filepath": filepath
-                    } for item in chunk_data]
+            try:
+                document_id, staged = self._insert_document(
+                    conn, filepath, filename, file_type, file_hash, file_size, modified_date, chunks
                 )
+                conn.commit()
+            finally:
+                conn.close()
             
-            conn.commit()
-            conn.close()
+            # FAISS vectors join the index only once their rows are committed
+            if staged:
+                for faiss_ids, vectors in staged:
+                    self._vector_store.add_staged(faiss_ids, vectors)
+                self._vector_store.flush()
             
             logger.info(f"Added document {filename}")
             return document_id
@@ -306,6 +358,89 @@ class DatabaseManager:
             logger.error(f"Failed to add document {filename}: {e}")
             return None
     
+    def _insert_document(self, conn: sqlite3.Connection, filepath: str, filename: str, file_type: str,
+                         file_hash: str, file_size: int, modified_date: datetime,
+                         chunks: List[str]) -> Tuple[int, List[Tuple]]:
+        """Insert a document, its chunks and their vectors in conn's open transaction"""
+        cursor = conn.cursor()
+            
+        # Insert document
+        cursor.execute('''
+            INSERT INTO documents 
+            (filename, filepath, file_hash, file_size, file_type, modified_date, chunk_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (filename, filepath, file_hash, file_size, file_type, modified_date, len(chunks)))
+        
+        document_id = cursor.lastrowid
+        
+        # Insert chunks in one statement; the UNIQUE(chunk_hash) constraint
+        # drops duplicates atomically instead of a check-then-insert per chunk
+        rows = [
+            (document_id, i, chunk, self.calculate_text_hash(chunk), f"doc_{document_id}_chunk_{i}")
+            for i, chunk in enumerate(chunks)
+        ]
+        cursor.executemany('''
+            INSERT OR IGNORE INTO document_chunks
+            (document_id, chunk_index, chunk_text, chunk_hash, vector_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+
+        # Rows now owned by this document are the ones actually inserted
+        cursor.execute(
+            "SELECT vector_id FROM document_chunks WHERE document_id = ?",
+            (document_id,)
+        )
+        inserted_ids = {row[0] for row in cursor.fetchall()}
+        chunk_data = [row for row in rows if row[4] in inserted_ids]
+
+        staged = []
+        if chunk_data:
+            staged = self._add_chunks_to_vector_store(conn, chunk_data, filename, filepath)
+        return document_id, staged
+    
+    def _add_chunks_to_vector_store(self, conn: sqlite3.Connection, chunk_data: List[Tuple],
+                                    filename: str, filepath: str) -> List[Tuple]:
+        """Embed chunks and add them to the vector database in microbatches.
+        
+        Embedding of the next microbatch runs on a worker thread while the
+        current one is inserted, so model inference and the HNSW insert overlap.
+        The FAISS backend only writes its mapping rows on conn; the staged
+        vectors it returns are added to the index after conn commits.
+        """
+        staged = []
+        batches = [
+            chunk_data[i:i + EMBEDDING_MICROBATCH_SIZE]
+            for i in range(0, len(chunk_data), EMBEDDING_MICROBATCH_SIZE)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self.generate_embeddings_batch, [item[2] for item in batches[0]])
+            
+            for index, batch in enumerate(batches):
+                embeddings = pending.result()
+                if index + 1 < len(batches):
+                    pending = executor.submit(
+                        self.generate_embeddings_batch, [item[2] for item in batches[index + 1]]
+                    )
+                
+                records = dict(
+                    embeddings=embeddings,
+                    documents=[item[2] for item in batch],  # chunk_text
+                    ids=[item[4] for item in batch],
+                    metadatas=[{
+                        "document_id": item[0],
+                        "chunk_index": item[1],
+                        "filename": filename,
+                        "filepath": filepath
+                    } for item in batch]
+                )
+                if self._vector_backend == 'faiss':
+                    staged.append(self._vector_store.stage(conn, **records))
+                else:
+                    self._vector_store.add(**records)
+        
+        return staged
+    
     def search_similar_documents(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
         """Search for similar documents using vector similarity"""
         try:
@@ -313,7 +448,7 @@ class DatabaseManager:
             query_embedding = self.generate_embedding(query)
             
             # Search in vector database
-            results = self.collection.query(
+            results = self._vector_store.query(
                 query_embeddings=[query_embedding],
                 n_results=top_k,
                 include=["documents", "metadatas", "distances"]
@@ -325,7 +460,8 @@ class DatabaseManager:
                 search_results.append({
                     'content': results['documents'][0][i],
                     'metadata': results['metadatas'][0][i],
-                    'similarity': 1 - results['distances'][0][i],  # Convert distance to similarity
+                    # Both ip and cosine spaces report 1 - dot product for unit vectors
+                    'similarity': 1 - results['distances'][0][i],
                     'vector_id': results['ids'][0][i]
                 })
             
@@ -335,11 +471,19 @@ class DatabaseManager:
             logger.error(f"Search failed: {e}")
             return []
     
-    def search_similar_documents_filtered(self, query: str, document_ids: List[int], top_k: int = 5) -> List[Dict[str, Any]]:
-        """Search for similar documents within a filtered set of document IDs"""
+    def search_similar_documents_filtered(self, query: str, document_ids: List[int], top_k: int = 5,
+                                          embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Search for similar documents within a filtered set of document IDs.
+        
+        A precomputed query embedding may be passed to skip generating it here.
+        """
+        if not document_ids:
+            return []
+        
         try:
             # Generate embedding for the query
-            embedding = self.embedding_model.encode(query)
+            if embedding is None:
+                embedding = self.generate_embedding(query)
             
             # Get chunk IDs for the specified documents
             conn = sqlite3.connect(self.metadata_db_path)
@@ -360,7 +504,7 @@ class DatabaseManager:
                 return []
             
             # Perform vector search with filtering by IDs
-            results = self.collection.query(
+            results = self._vector_store.query(
                 query_embeddings=[embedding],
                 n_results=min(top_k, len(allowed_chunk_ids)),
                 ids=allowed_chunk_ids,
@@ -421,44 +565,61 @@ class DatabaseManager:
             logger.error(f"Failed to get document info: {e}")
             return None
     
+    def _metadata_db_signature(self) -> Tuple:
+        """Return a value that changes whenever the metadata database is written"""
+        signature = []
+        # In WAL mode writes land in the -wal file until a checkpoint
+        for path in (self.metadata_db_path, self.metadata_db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
+            signature = self._metadata_db_signature()
+            cached = self._stats_cache
+            if cached and cached[0] == signature:
+                return dict(cached[1])
+            
             conn = sqlite3.connect(self.metadata_db_path)
             cursor = conn.cursor()
             
-            # Get document count
-            cursor.execute("SELECT COUNT(*) FROM documents")
-            doc_count = cursor.fetchone()[0]
-            
-            # Get chunk count
-            cursor.execute("SELECT COUNT(*) FROM document_chunks")
-            chunk_count = cursor.fetchone()[0]
-            
-            # Get total file size
-            cursor.execute("SELECT SUM(file_size) FROM documents")
-            total_size = cursor.fetchone()[0] or 0
-            
-            # Get file type distribution
+            # Get document count, chunk count and total file size in one statement
             cursor.execute('''
-                SELECT file_type, COUNT(*) 
-                FROM documents 
-                GROUP BY file_type
+                SELECT (SELECT COUNT(*) FROM documents),
+                       (SELECT COUNT(*) FROM document_chunks),
+                       (SELECT COALESCE(SUM(file_size), 0) FROM documents)
             ''')
-            file_types = dict(cursor.fetchall())
+            doc_count, chunk_count, total_size = cursor.fetchone()
+            
+            # Get file type distribution
+            file_types = {}
+            if doc_count:
+                cursor.execute('''
+                    SELECT file_type, COUNT(*) 
+                    FROM documents 
+                    GROUP BY file_type
+                ''')
+                file_types = dict(cursor.fetchall())
             
             conn.close()
             
             # Get vector database stats
-            vector_count = self.collection.count()
+            vector_count = self._vector_store.count()
             
-            return {
+            stats = {
                 'document_count': doc_count,
                 'chunk_count': chunk_count,
                 'vector_count': vector_count,
                 'total_file_size': total_size,
                 'file_type_distribution': file_types
             }
+            self._stats_cache = (signature, stats)
+            return dict(stats)
             
         except Exception as e:
             logger.error(f"Failed to get database stats: {e}")
@@ -9,14 +9,182 @@ import yaml
 from typing import Dict, List, Tuple
 import logging
 
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; regex path is used without it
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Characters that re.IGNORECASE matches to ASCII letters but str.lower() does not fold
+_IGNORECASE_FOLD = str.maketrans({'ı': 'i', 'İ': 'i', 'ſ': 's'})
+
+_WORD_CHAR = re.compile(r'\w')
+
+_DIGIT = re.compile(r'\d')
+
+def _fold_case(text: str) -> str:
+    """Lowercase text so substring tests agree with re.IGNORECASE matching"""
+    return text.translate(_IGNORECASE_FOLD).lower()
+
+def _trie_alternation(words: List[str]) -> str:
+    """Build a prefix-factored regex alternation matching any of the given words.
+    
+    Longer continuations are tried before a word ends, so the first match at a
+    position is the longest one, as with a longest-first flat alternation, but
+    the regex engine branches once per character instead of once per word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if ends_here else pattern
+    
+    return build(trie)
+
 class DocumentPreprocessor:
     """Preprocesses documents for consistent indexing"""
 
     def __init__(self, theological_corrections: Dict[str, str] = None):
         self.theological_corrections = theological_corrections or self._get_default_theological_corrections()
         self.book_name_mappings = self._get_book_name_mappings()
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Compile all normalization and correction patterns once per preprocessor"""
+        # Underscore separators (e.g., Mal_3:16)
+        self._underscore_re = re.compile(r'([a-zA-Z]+)_+(\d+):(\d+)')
+        
+        # Punctuation and spacing fixes, applied in order
+        self._norm_patterns = [(re.compile(pattern), replacement) for pattern, replacement in [
+            # Remove extra periods in abbreviations: "Matt." -> "Matt"
+            (r'\b([a-zA-Z]+)\.+(\s*\d+)', r'\1 \2'),
+            # Normalize spacing around colons: "3 : 16" -> "3:16"
+            (r'(\d+)\s*:\s*(\d+)', r'\1:\2'),
+            # Handle multiple spaces: "1  John" -> "1 John"
+            (r'\b(\d+)\s+(\w+)', r'\1 \2'),
+            # Handle roman numerals: "I John" -> "1 John", "II John" -> "2 John"
+            (r'\bI\s+([a-zA-Z]+)', r'1 \1'),
+            (r'\bII\s+([a-zA-Z]+)', r'2 \1'),
+            (r'\bIII\s+([a-zA-Z]+)', r'3 \1'),
+        ]]
+        
+        # All book abbreviations in one prefix-factored alternation, only when
+        # followed by chapter/verse or by a chapter number
+        self._book_re = re.compile(
+            r'\b(' + _trie_alternation(list(self.book_name_mappings)) + r')\.?'
+            r'(?=\s+\d+[:\s]?\d+|\s+\d+\s)',
+            re.IGNORECASE
+        )
+        
+        # Theological term corrections as (folded term, pattern, replacement, case_only);
+        # case-only corrections leave the case-folded text unchanged
+        self._term_patterns = [
+            (
+                _fold_case(term),
+                re.compile(rf'\b{re.escape(term)}\b', re.IGNORECASE),
+                correct_term,
+                _fold_case(term) == _fold_case(correct_term)
+            )
+            for term, correct_term in self.theological_corrections.items()
+        ]
+        # First characters of the folded terms; text sharing none of them cannot match
+        folded_terms = [_fold_case(term) for term in self.theological_corrections]
+        self._term_first_chars = (
+            frozenset(term[0] for term in folded_terms) if all(folded_terms) else None
+        )
+        self._term_automaton = self._build_term_automaton()
+        self._master_re = self._build_master_pattern()
+    
+    def _build_term_automaton(self):
+        """Build an Aho-Corasick automaton over the folded correction terms.
+        
+        A single automaton pass is equivalent to the sequential regex passes
+        only when every correction changes case alone and every term starts
+        and ends with a word character; otherwise None is returned and the
+        regex path is used.
+        """
+        if ahocorasick is None:
+            return None
+        
+        for term, correct_term in self.theological_corrections.items():
+            if not term or _fold_case(term) != _fold_case(correct_term):
+                return None
+            if not (_WORD_CHAR.match(term[0]) and _WORD_CHAR.match(term[-1])):
+                return None
+        
+        automaton = ahocorasick.Automaton()
+        for term, correct_term in self.theological_corrections.items():
+            folded_term = _fold_case(term)
+            automaton.add_word(folded_term, (len(folded_term), correct_term))
+        automaton.make_automaton()
+        return automaton
+        
+    def _build_master_pattern(self):
+        """Build one regex that expands book names and corrects terms in a single scan.
+        
+        The fused scan matches the sequential book-then-term passes only when
+        every correction changes case alone, every term is word-bounded, and no
+        multi-word term can straddle the edge of an expanded book name; otherwise
+        None is returned and the passes run separately. Expanded names are
+        term-corrected up front, as the term pass would have done.
+        """
+        for term, correct_term in self.theological_corrections.items():
+            if not term or _fold_case(term) != _fold_case(correct_term):
+                return None
+            if not (_WORD_CHAR.match(term[0]) and _WORD_CHAR.match(term[-1])):
+                return None
+        
+        # Every leading and trailing run of words in an expanded book name
+        name_words = set()
+        for name in set(self.book_name_mappings.values()):
+            words = tuple(re.findall(r'\w+', _fold_case(name)))
+            name_words.update(words[:i] for i in range(1, len(words) + 1))
+            name_words.update(words[i:] for i in range(len(words)))
+        for term in self.theological_corrections:
+            words = tuple(re.findall(r'\w+', _fold_case(term)))
+            for i in range(1, len(words)):
+                if words[:i] in name_words or words[i:] in name_words:
+                    return None
+        
+        self._master_books = {
+            abbrev: self.correct_theological_terms(name)
+            for abbrev, name in self.book_name_mappings.items()
+        }
+        self._master_terms = {
+            _fold_case(term): correct_term
+            for term, correct_term in self.theological_corrections.items()
+        }
+        return re.compile(
+            r'\b(?:(?P<book>' + _trie_alternation(list(self.book_name_mappings)) + r')\.?'
+            r'(?=\s+\d+[:\s]?\d+|\s+\d+\s)'
+            r'|(?P<term>' + _trie_alternation(list(self.theological_corrections)) + r')\b)',
+            re.IGNORECASE
+        )
+    
+    def _dispatch_master(self, match: re.Match) -> str:
+        """Replacement callback for the fused book-name and term pattern"""
+        book = match.group('book')
+        if book is not None:
+            # Folded like _expand_book_name, for the case pairs str.lower() misses
+            return self._master_books[_fold_case(book)]
+        term = match.group('term')
+        correct_term = self._master_terms.get(_fold_case(term))
+        if correct_term is None:
+            # Case pairs re.IGNORECASE matches but str.lower() does not fold
+            return self.correct_theological_terms(term)
+        return correct_term
         
     def _get_book_name_mappings(self) -> Dict[str, str]:
         """Get mapping of abbreviated book names to full names"""
@@ -94,37 +262,34 @@ class DocumentPreprocessor:
 
     def normalize_scripture_references(self, text: str) -> str:
         """Convert all formats of scripture references to a consistent style"""
-        # First, handle underscore separators (e.g., Mal_3:16)
-        text = re.sub(r'([a-zA-Z]+)_+(\d+):(\d+)', r'\1 \2:\3', text)
+        text = self._normalize_reference_punctuation(text)
         
-        # Handle various punctuation and spacing issues
-        patterns = [
-            # Remove extra periods in abbreviations: "Matt." -> "Matt"
-            (r'\b([a-zA-Z]+)\.+(\s*\d+)', r'\1 \2'),
-            # Normalize spacing around colons: "3 : 16" -> "3:16"
-            (r'(\d+)\s*:\s*(\d+)', r'\1:\2'),
-            # Handle multiple spaces: "1  John" -> "1 John"
-            (r'\b(\d+)\s+(\w+)', r'\1 \2'),
-            # Handle roman numerals: "I John" -> "1 John", "II John" -> "2 John"
-            (r'\bI\s+([a-zA-Z]+)', r'1 \1'),
-            (r'\bII\s+([a-zA-Z]+)', r'2 \1'),
-            (r'\bIII\s+([a-zA-Z]+)', r'3 \1'),
-        ]
+        # Expand abbreviated book names to full names (only when followed by numbers)
+        if _DIGIT.search(text):
+            text = self._book_re.sub(self._expand_book_name, text)
         
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text)
+        return text
+
+    def _normalize_reference_punctuation(self, text: str) -> str:
+        """Fix separators, punctuation and spacing in scripture references"""
+        # Every pattern needs a digit except the roman numeral ones, which need "I"
+        if 'I' not in text and not _DIGIT.search(text):
+            return text
         
-        # Expand abbreviated book names to full names (only when followed by numbers)
-        for abbrev, full_name in self.book_name_mappings.items():
-            # Only replace if followed by chapter/verse pattern (with optional period and flexible spacing)
-            pattern = rf'\b{re.escape(abbrev)}\.?(?=\s+\d+[:\s]?\d+)'
-            text = re.sub(pattern, full_name, text, flags=re.IGNORECASE)
-            # Also handle case where book name is followed by just chapter number
-            pattern2 = rf'\b{re.escape(abbrev)}\.?(?=\s+\d+\s)'
-            text = re.sub(pattern2, full_name, text, flags=re.IGNORECASE)
+        # First, handle underscore separators (e.g., Mal_3:16)
+        text = self._underscore_re.sub(r'\1 \2:\3', text)
+        
+        # Handle various punctuation and spacing issues
+        for pattern, replacement in self._norm_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
+    def _expand_book_name(self, match: re.Match) -> str:
+        """Replacement callback mapping a matched abbreviation to its full book name"""
+        # Fold the case pairs re.IGNORECASE matches but str.lower() does not
+        return self.book_name_mappings[_fold_case(match.group(1))]
+
     def _get_default_theological_corrections(self) -> Dict[str, str]:
         """Get default theological term corrections"""
         return {
@@ -205,16 +370,61 @@ class DocumentPreprocessor:
 
     def correct_theological_terms(self, text: str) -> str:
         """Corrects common theological concept misspellings"""
-        for term, correct_term in self.theological_corrections.items():
-            pattern = rf'\b{re.escape(term)}\b'
-            text = re.sub(pattern, correct_term, text, flags=re.IGNORECASE)
+        folded = _fold_case(text)
+        if self._term_first_chars is not None and self._term_first_chars.isdisjoint(folded):
+            return text
+        if self._term_automaton is not None and len(folded) == len(text):
+            return self._correct_terms_with_automaton(text, folded)
+        
+        for term, pattern, correct_term, case_only in self._term_patterns:
+            # Plain substring test on the folded text before paying for a regex scan
+            if term not in folded:
+                continue
+            text = pattern.sub(correct_term, text)
+            if not case_only:
+                folded = _fold_case(text)
         
         return text
 
+    def _correct_terms_with_automaton(self, text: str, folded: str) -> str:
+        """Apply term corrections in one Aho-Corasick scan of the folded text"""
+        # Collect word-bounded matches, then keep leftmost-longest non-overlapping ones
+        candidates = []
+        for end, (length, correct_term) in self._term_automaton.iter(folded):
+            start = end - length + 1
+            if start > 0 and _WORD_CHAR.match(text, start - 1):
+                continue
+            if end + 1 < len(text) and _WORD_CHAR.match(text, end + 1):
+                continue
+            candidates.append((start, -length, correct_term))
+        
+        if not candidates:
+            return text
+        
+        candidates.sort()
+        parts = []
+        position = 0
+        for start, negative_length, correct_term in candidates:
+            if start < position:
+                continue
+            parts.append(text[position:start])
+            parts.append(correct_term)
+            position = start - negative_length
+        parts.append(text[position:])
+        return ''.join(parts)
+
     def preprocess_document(self, text: str) -> str:
         """Complete preprocessing for a document"""
-        text = self.normalize_scripture_references(text)
-        text = self.correct_theological_terms(text)
+        if self._master_re is not None:
+            text = self._normalize_reference_punctuation(text)
+            if _DIGIT.search(text):
+                text = self._master_re.sub(self._dispatch_master, text)
+            else:
+                # No book name can match, so only the terms need correcting
+                text = self.correct_theological_terms(text)
+        else:
+            text = self.normalize_scripture_references(text)
+            text = self.correct_theological_terms(text)
         return text
 
 
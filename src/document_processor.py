@@ -2,8 +2,8 @@
 
 import os
 import re
+import csv
 import logging
-import pandas as pd
 import PyPDF2
 import docx
 import pdfplumber
@@ -12,23 +12,117 @@ from PIL import Image
 import tabula
 import magic
 import io
-from typing import List, Dict, Optional, Tuple
+import threading
+import multiprocessing
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from tqdm import tqdm
 from .database_manager import DatabaseManager
 from .document_preprocessor import DocumentPreprocessor
 
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # optional; pdfplumber handles every page without it
+    fitz = None
+
 logger = logging.getLogger(__name__)
 
 SUPPORTED_FORMATS = ['.txt', '.pdf', '.doc', '.docx', '.csv', '.jpg', '.jpeg', '.png', '.tiff', '.bmp']
 
+WHITESPACE_RUN_PATTERN = re.compile(r'\s+')
+WORD_PATTERN = re.compile(r'\S+')
+
+# Files extracted ahead of database insertion, per worker thread
+MAX_IN_FLIGHT_PER_WORKER = 2
+
+# PDFs with at least this many pages are extracted in a process pool
+PARALLEL_PDF_MIN_PAGES = 32
+
+def _count_pdf_pages(file_path: str) -> int:
+    """Return the number of pages in a PDF file."""
+    if fitz is not None:
+        with fitz.open(file_path) as doc:
+            return len(doc)
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> str:
+    """Extract text and tables from pages [start, end) of a PDF file.
+    
+    Module-level so it can run in a process pool worker.
+    """
+    if fitz is None:
+        with pdfplumber.open(file_path) as pdf:
+            return "".join(_extract_pdfplumber_page(page) for page in pdf.pages[start:end])
+    
+    # MuPDF extracts plain text far faster than pdfminer; pdfplumber is only
+    # opened for pages that contain tables, to keep its table formatting
+    parts = []
+    plumber_pdf = None
+    try:
+        with fitz.open(file_path) as doc:
+            for page_number in range(start, end):
+                page = doc[page_number]
+                if page.find_tables().tables:
+                    if plumber_pdf is None:
+                        plumber_pdf = pdfplumber.open(file_path)
+                    parts.append(_extract_pdfplumber_page(plumber_pdf.pages[page_number]))
+                else:
+                    parts.append(page.get_text("text"))
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+    return "".join(parts)
+
+def _extract_pdfplumber_page(page) -> str:
+    """Extract text and tables from a single pdfplumber page."""
+    parts = [page.extract_text() or ""]
+    for table in page.extract_tables():
+        parts.append("\n")
+        parts.append(DocumentProcessor.format_table(table))
+    return "".join(parts)
+
 class DocumentProcessor:
     def __init__(self, config: Dict[str, any], db_manager: DatabaseManager):
         self.config = config
         self.db_manager = db_manager
         self.max_chunk_size = config['database']['max_chunk_size']
         self.chunk_overlap = config['database']['chunk_overlap']
+        if self.max_chunk_size - self.chunk_overlap <= 0:
+            raise ValueError(
+                f"chunk_overlap ({self.chunk_overlap}) must be smaller than max_chunk_size ({self.max_chunk_size})"
+            )
+        self.max_workers = config.get('performance', {}).get('max_workers') or os.cpu_count()
+        
+        # OCR settings: images are downscaled to ocr_max_dimension on the long edge
+        processing_config = config.get('document_processing', {})
+        self.ocr_max_dimension = processing_config.get('ocr_max_dimension', 2000)
+        self.ocr_config = processing_config.get('ocr_config', '--oem 1 --psm 6')
+        
+        # Loading the libmagic database is expensive, so share one detector
+        self._mime = magic.Magic(mime=True)
+        
+        # Page-range extraction pool shared by every extract_pdf call, created on
+        # first use. Worker processes are started from a clean server process
+        # rather than forked from this multi-threaded one
+        self._pdf_pool = None
+        self._pdf_pool_lock = threading.Lock()
+        
+        # Extraction handler for each entry in SUPPORTED_FORMATS
+        self._handlers = {
+            '.txt': self._extract_txt,
+            '.pdf': self.extract_pdf,
+            '.doc': self.extract_word,
+            '.docx': self.extract_word,
+            '.csv': self.extract_csv,
+            '.jpg': self.extract_image_text,
+            '.jpeg': self.extract_image_text,
+            '.png': self.extract_image_text,
+            '.tiff': self.extract_image_text,
+            '.bmp': self.extract_image_text,
+        }
         
         # Initialize document preprocessor
         self.preprocessor = DocumentPreprocessor()
@@ -44,48 +138,120 @@ class DocumentProcessor:
         skipped_count = 0
         error_count = 0
         
-        for root, _, files in os.walk(directory):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self.is_supported(file_path):
-                    # Check if document is already processed
-                    if self.db_manager.is_document_already_processed(file_path):
-                        logger.info(f"Skipping already processed file: {file}")
-                        skipped_count += 1
-                        continue
-                        
-                    logger.info(f"Processing file: {file}")
-                    try:
-                        doc_text = self.extract_text(file_path)
-                        if not doc_text.strip():
-                            logger.warning(f"No text extracted from {file_path}")
-                            continue
-                            
-                        chunks = self.chunk_text(doc_text)
-                        if not chunks:
-                            logger.warning(f"No chunks created from {file_path}")
-                            continue
-                            
-                        result = self.db_manager.add_document(file_path, file, self.get_file_type(file_path), chunks)
-                        if result:
+        # Load processed documents once instead of querying per file
+        processed_paths = self.db_manager.get_all_processed_paths()
+        processed_hashes = self.db_manager.get_all_processed_hashes()
+        
+        # Extraction and chunking run on worker threads (pdfplumber, OCR and
+        # docx parsing spend most of their time outside the GIL); database
+        # insertion stays on this thread so writes are serialized. Files are
+        # submitted as the directory walk finds them, with at most
+        # MAX_IN_FLIGHT_PER_WORKER files per worker extracted but not yet
+        # inserted, so prepared text never piles up ahead of insertion.
+        max_in_flight = self.max_workers * MAX_IN_FLIGHT_PER_WORKER
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for file_path in self._iter_supported_files(directory):
+                # Check if document is already processed
+                if self._is_already_processed(file_path, processed_paths, processed_hashes):
+                    logger.info(f"Skipping already processed file: {os.path.basename(file_path)}")
+                    skipped_count += 1
+                    continue
+                futures[executor.submit(self._prepare_file, file_path)] = file_path
+                
+                # Insert finished files while the walk continues
+                if len(futures) >= max_in_flight:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        added = self._add_prepared_file(future, futures.pop(future))
+                        if added:
                             processed_count += 1
-                            logger.info(f"Successfully processed file: {file}")
-                        else:
+                        elif added is not None:
                             error_count += 1
-                            logger.error(f"Failed to add file: {file} to database")
-                            
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Failed to process file: {file}: {e}")
+            
+            for future in as_completed(futures):
+                added = self._add_prepared_file(future, futures[future])
+                if added:
+                    processed_count += 1
+                elif added is not None:
+                    error_count += 1
                         
         logger.info(f"Processing complete: {processed_count} files processed, {skipped_count} files skipped, {error_count} errors")
 
+    def _add_prepared_file(self, future, file_path: str) -> Optional[bool]:
+        """Insert a file prepared on a worker thread; returns None when there was nothing to add."""
+        file = os.path.basename(file_path)
+        try:
+            prepared = future.result()
+            if prepared is None:
+                return None
+            
+            chunks, file_type = prepared
+            result = self.db_manager.add_document(file_path, file, file_type, chunks)
+            if result:
+                logger.info(f"Successfully processed file: {file}")
+                return True
+            logger.error(f"Failed to add file: {file} to database")
+            return False
+                
+        except Exception as e:
+            logger.error(f"Failed to process file: {file}: {e}")
+            return False
+
+    def _iter_supported_files(self, directory: str):
+        """Yield supported files under a directory, skipping hidden directories."""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            yield from self._iter_supported_files(entry.path)
+                    elif self.is_supported(entry.name):
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+
+    def _is_already_processed(self, file_path: str, processed_paths: Set[str], processed_hashes: Set[str]) -> bool:
+        """Check a file against preloaded processed paths, falling back to its content hash.
+        
+        The hash of a file that is not yet processed is added to processed_hashes,
+        so later files with the same content in this run are skipped.
+        """
+        if file_path in processed_paths:
+            return True
+        file_hash = self.db_manager.calculate_file_hash(file_path)
+        if not file_hash:
+            return False
+        if file_hash in processed_hashes:
+            return True
+        processed_hashes.add(file_hash)
+        return False
+
+    def _prepare_file(self, file_path: str) -> Optional[Tuple[List[str], str]]:
+        """Extract and chunk a file for insertion; returns None when there is nothing to add."""
+        logger.info(f"Processing file: {os.path.basename(file_path)}")
+        doc_text = self.extract_text(file_path)
+        if not doc_text.strip():
+            logger.warning(f"No text extracted from {file_path}")
+            return None
+            
+        chunks = self.chunk_text(doc_text)
+        if not chunks:
+            logger.warning(f"No chunks created from {file_path}")
+            return None
+            
+        return chunks, self.get_file_type(file_path)
+
     def process_specific_files(self, file_paths: List[str], force: bool = False):
         """Process a specific list of files."""
         processed_count = 0
         skipped_count = 0
         error_count = 0
         
+        if not force:
+            processed_paths = self.db_manager.get_all_processed_paths()
+            processed_hashes = self.db_manager.get_all_processed_hashes()
+        
         for file_path in file_paths:
             if not os.path.exists(file_path):
                 logger.warning(f"File {file_path} does not exist")
@@ -98,7 +264,7 @@ class DocumentProcessor:
                 continue
                 
             # Check if document is already processed (unless force is True)
-            if not force and self.db_manager.is_document_already_processed(file_path):
+            if not force and self._is_already_processed(file_path, processed_paths, processed_hashes):
                 logger.info(f"Skipping already processed file: {os.path.basename(file_path)}")
                 skipped_count += 1
                 continue
@@ -134,28 +300,18 @@ class DocumentProcessor:
 
     def is_supported(self, file_path: str) -> bool:
         """Check if the file format is supported."""
-        return any(file_path.endswith(ext) for ext in SUPPORTED_FORMATS)
+        return os.path.splitext(file_path)[1].lower() in self._handlers
 
     def get_file_type(self, file_path: str) -> str:
         """Detect the MIME type of a file."""
-        mime = magic.Magic(mime=True)
-        return mime.from_file(file_path)
+        return self._mime.from_file(file_path)
 
     def extract_text(self, file_path: str) -> str:
         """Extract text, tables, and images from different document formats."""
-        raw_text = ""
-
-        if file_path.endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                raw_text = f.read()
-        elif file_path.endswith('.pdf'):
-            raw_text = self.extract_pdf(file_path)
-        elif file_path.endswith(('.doc', '.docx')):
-            raw_text = self.extract_word(file_path)
-        elif file_path.endswith('.csv'):
-            raw_text = self.extract_csv(file_path)
-        else:
+        handler = self._handlers.get(os.path.splitext(file_path)[1].lower())
+        if handler is None:
             raise ValueError(f"Unsupported file format: {file_path}")
+        raw_text = handler(file_path)
 
         # Apply preprocessing to normalize scripture references and theological terms
         try:
@@ -166,55 +322,99 @@ class DocumentProcessor:
             logger.warning(f"Preprocessing failed for {file_path}: {e}. Using raw text.")
             return raw_text
 
+    def _extract_txt(self, file_path: str) -> str:
+        """Read a plain text file."""
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+
     def extract_pdf(self, file_path: str) -> str:
         """Extract text and tables from a PDF file."""
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-                tables = page.extract_tables()
-                for table in tables:
-                    text += "\n" + self.format_table(table)
-        return text
+        num_pages = _count_pdf_pages(file_path)
+        if num_pages < PARALLEL_PDF_MIN_PAGES or self.max_workers < 2:
+            return _extract_pdf_pages(file_path, 0, num_pages)
+        
+        # Table extraction is pure Python and holds the GIL, so large PDFs are
+        # split into page ranges extracted in separate processes
+        workers = min(self.max_workers, num_pages)
+        step = -(-num_pages // workers)
+        starts = range(0, num_pages, step)
+        ends = [min(start + step, num_pages) for start in starts]
+        executor = self._get_pdf_pool()
+        return "".join(executor.map(_extract_pdf_pages, [file_path] * len(starts), starts, ends))
+
+    def _get_pdf_pool(self) -> ProcessPoolExecutor:
+        """Return the shared PDF extraction pool, creating it on first use."""
+        with self._pdf_pool_lock:
+            if self._pdf_pool is None:
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._pdf_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method)
+                )
+            return self._pdf_pool
+
+    def close(self):
+        """Shut down the PDF extraction pool, if one was started."""
+        with self._pdf_pool_lock:
+            if self._pdf_pool is not None:
+                self._pdf_pool.shutdown()
+                self._pdf_pool = None
 
     def extract_word(self, file_path: str) -> str:
         """Extract text and tables from a Word document."""
         doc = docx.Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        parts = ["\n".join([para.text for para in doc.paragraphs])]
         for table in doc.tables:
-            text += "\n" + self.format_table([[cell.text for cell in row.cells] for row in table.rows])
-        return text
+            parts.append("\n")
+            parts.append(self.format_table([[cell.text for cell in row.cells] for row in table.rows]))
+        return "".join(parts)
 
     def extract_csv(self, file_path: str) -> str:
         """Extract text from a CSV file."""
-        df = pd.read_csv(file_path)
-        return df.to_string()
+        # Stream rows straight into text; a DataFrame is only needed for analysis
+        with open(file_path, 'r', newline='', encoding='utf-8', errors='ignore') as f:
+            return "".join("\t".join(row) + "\n" for row in csv.reader(f))
 
-    def format_table(self, table: list) -> str:
+    @staticmethod
+    def format_table(table: list) -> str:
         """Format table data as text."""
-        formatted_table = ""
-        for row in table:
-            # Handle None values in table cells
-            cleaned_row = [str(cell) if cell is not None else "" for cell in row]
-            formatted_table += "\t".join(cleaned_row) + "\n"
-        return formatted_table
+        # None cells (merged or empty in the source) become empty strings
+        return "".join(
+            "\t".join("" if cell is None else str(cell) for cell in row) + "\n"
+            for row in table
+        )
 
     def chunk_text(self, text: str) -> List[str]:
         """Chunk text into smaller pieces for storage."""
-        words = text.split()
+        # Collapse whitespace once so every chunk is a slice of one string, and
+        # stream word offsets through a sliding window instead of a word list
+        joined = WHITESPACE_RUN_PATTERN.sub(" ", text).strip()
+        stride = self.max_chunk_size - self.chunk_overlap
+        window = deque(maxlen=self.max_chunk_size)
+        
         chunks = []
-        for start in range(0, len(words), self.max_chunk_size - self.chunk_overlap):
-            end = start + self.max_chunk_size
-            chunk = " ".join(words[start:end])
-            chunks.append(chunk)
+        for match in WORD_PATTERN.finditer(joined):
+            window.append(match.span())
+            if len(window) == self.max_chunk_size:
+                chunks.append(joined[window[0][0]:window[-1][1]])
+                for _ in range(stride):
+                    window.popleft()
+        
+        # Trailing windows shorter than max_chunk_size
+        while window:
+            chunks.append(joined[window[0][0]:window[-1][1]])
+            for _ in range(min(stride, len(window))):
+                window.popleft()
         return chunks
 
     def extract_image_text(self, file_path: str) -> str:
         """Extract text from images using OCR."""
         text = ""
         try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
+            with Image.open(file_path) as image:
+                # Tesseract time grows with pixel count; thumbnail() only ever shrinks
+                image.thumbnail((self.ocr_max_dimension, self.ocr_max_dimension), Image.LANCZOS)
+                text = pytesseract.image_to_string(image, config=self.ocr_config)
             logger.info(f"Extracted text from image in {file_path}")
         except Exception as e:
             logger.error(f"Failed to extract image text from {file_path}: {e}")
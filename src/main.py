@@ -53,7 +53,10 @@ def main():
         document_processor = DocumentProcessor(config, db_manager)
         input_directory = config['document_processing']['input_folder']
         logger.info(f"Processing documents in {input_directory} ...")
-        document_processor.process_directory(input_directory)
+        try:
+            document_processor.process_directory(input_directory)
+        finally:
+            document_processor.close()
 
         # Display updated database stats
         stats = db_manager.get_database_stats()
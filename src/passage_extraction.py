@@ -0,0 +1,103 @@
+"""
+Passage Extraction
+Picks the paragraph or sentences of a search result that best match a query,
+shared by the terminal and web interfaces
+"""
+
+import re
+import heapq
+from itertools import chain
+from operator import itemgetter
+
+# Paragraph and sentence separators for extracting result context
+_PARA_RE = re.compile(r'\n\s*\n')
+_SENT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\w+')
+
+def _iter_passages(text: str, text_lower: str, separator: re.Pattern):
+    """Yield stripped, non-empty (passage, lowercased passage) pairs of text split on separator"""
+    # A few characters lowercase to several; offsets only line up without them
+    if len(text_lower) != len(text):
+        for passage in separator.split(text):
+            stripped = passage.strip()
+            if stripped:
+                yield stripped, stripped.lower()
+        return
+
+    start = 0
+    for match in chain(separator.finditer(text), (None,)):
+        end = match.start() if match else len(text)
+        passage = text[start:end]
+        stripped = passage.strip()
+        if stripped:
+            offset = start + len(passage) - len(passage.lstrip())
+            yield stripped, text_lower[offset:offset + len(stripped)]
+        if match:
+            start = match.end()
+
+def _top_passages(passages, query_words: set, count: int) -> list:
+    """Return up to count passages with the most query words, earliest first among ties"""
+    scored = (
+        (passage, word_matches)
+        for passage, passage_lower in passages
+        if (word_matches := len(query_words.intersection(_WORD_RE.findall(passage_lower)))) > 0
+    )
+    return [passage for passage, _ in heapq.nlargest(count, scored, key=itemgetter(1))]
+
+def extract_full_content(content: str, query: str) -> str:
+    """Extract full sentences or paragraphs containing the query context.
+
+    Passages are scored by how many distinct query words they contain as whole words.
+    """
+    query_words = {word for word in _WORD_RE.findall(query.lower()) if len(word) > 2}  # Skip short words
+
+    # Nothing can score without query words, so skip both scans
+    if not query_words:
+        return content if len(content) <= 300 else content[:300] + "..."
+
+    # Lowercase once; passages are sliced from both copies at the same offsets
+    content_lower = content.lower()
+
+    # A passage containing a query word contains it as a substring of the
+    # whole text, so one C-level search per word rules out large documents
+    # with no matches before they are split and tokenized
+    if not any(word in content_lower for word in query_words):
+        return content if len(content) <= 300 else content[:300] + "..."
+
+    # First try paragraphs (double newlines), scoring each as it is split
+    best_paragraph = None
+    best_matches = 0
+    for paragraph, paragraph_lower in _iter_passages(content, content_lower, _PARA_RE):
+        # Count how many query words are in this paragraph
+        word_matches = len(query_words.intersection(_WORD_RE.findall(paragraph_lower)))
+        if word_matches > best_matches:
+            best_paragraph, best_paragraph_lower, best_matches = paragraph, paragraph_lower, word_matches
+            # No later paragraph can beat one containing every query word
+            if word_matches == len(query_words):
+                break
+
+    if best_paragraph is not None:
+        # If paragraph is reasonable length, return it as is
+        if len(best_paragraph) <= 500:
+            return best_paragraph
+        else:
+            # If too long, take the top 2-3 most relevant sentences from the paragraph
+            top_sentences = _top_passages(
+                _iter_passages(best_paragraph, best_paragraph_lower, _SENT_RE), query_words, 3
+            )
+            if top_sentences:
+                return '. '.join(top_sentences) + '.'
+            else:
+                # Fallback to first part of paragraph
+                return best_paragraph[:400] + "..."
+
+    # If no paragraphs match, take the top sentences from the whole content
+    top_sentences = _top_passages(_iter_passages(content, content_lower, _SENT_RE), query_words, 2)
+    if top_sentences:
+        return '. '.join(top_sentences) + '.'
+
+    # Fallback to beginning of content
+    if len(content) <= 300:
+        return content
+    else:
+        return content[:300] + "..."
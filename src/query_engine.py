@@ -6,6 +6,7 @@ Integrates vector search with Ollama for contextual responses
 import time
 import logging
 import ollama
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from .database_manager import DatabaseManager
 from .bible_lookup import BibleLookup
@@ -24,6 +25,9 @@ class QueryEngine:
         self.max_results = config['output']['max_results']
         self.include_sources = config['output']['include_sources']
         
+        # Computes query embeddings while filter lookups run on the calling thread
+        self._embedding_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='query-embedding')
+        
         # Initialize Bible lookup system
         self.bible_lookup = BibleLookup()
         
@@ -96,7 +100,7 @@ class QueryEngine:
         Returns:
             Dictionary containing search results and generated response
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         if top_k is None:
             top_k = self.max_results
@@ -126,7 +130,7 @@ class QueryEngine:
                 logger.error(f"LLM response generation failed: {e}")
                 response_data['llm_response'] = "Error generating LLM response. Vector search results available."
         
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         response_data['execution_time'] = execution_time
         
         # Save query to history
@@ -327,7 +331,11 @@ Provide a comprehensive answer based on the information provided above."""
     
     def query_with_scripture_filter(self, query_text: str, scripture_filter: str, use_llm: bool = True) -> Dict[str, Any]:
         """Query with scripture reference filtering"""
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        # The query embedding does not depend on the scripture lookup, so
+        # generate it concurrently; it is discarded if nothing matches
+        embedding_future = self._embedding_executor.submit(self.db_manager.generate_embedding, query_text)
         
         # First, find documents containing the scripture reference
         scripture_results = self.search_by_scripture(scripture_filter)
@@ -338,7 +346,7 @@ Provide a comprehensive answer based on the information provided above."""
                 'scripture_filter': scripture_filter,
                 'search_results': [],
                 'llm_response': f"No documents found containing scripture reference: {scripture_filter}",
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time,
                 'sources_used': []
             }
         
@@ -349,7 +357,8 @@ Provide a comprehensive answer based on the information provided above."""
         filtered_search_results = self.db_manager.search_similar_documents_filtered(
             query_text, 
             document_ids=doc_ids, 
-            top_k=self.max_results
+            top_k=self.max_results,
+            embedding=embedding_future.result()
         )
         
         response_data = {
@@ -378,7 +387,7 @@ Provide a comprehensive answer based on the information provided above."""
                 logger.error(f"LLM response generation failed: {e}")
                 response_data['llm_response'] = "Error generating LLM response. Vector search results available."
         
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         response_data['execution_time'] = execution_time
         
         return response_data
@@ -394,7 +403,7 @@ Provide a comprehensive answer based on the information provided above."""
 
     def query_with_theological_and_scripture_filter(self, query_text: str, concept_filter: str, scripture_filter: str, use_llm: bool = True) -> Dict[str, Any]:
         """Query with both theological concept and scripture reference filtering"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Find documents containing the theological concept
         concept_results = self.search_by_theological_concept(concept_filter)
@@ -406,7 +415,7 @@ Provide a comprehensive answer based on the information provided above."""
                 'scripture_filter': scripture_filter,
                 'search_results': [],
                 'llm_response': f"No documents found containing theological concept: {concept_filter}",
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time,
                 'sources_used': []
             }
 
@@ -420,7 +429,7 @@ Provide a comprehensive answer based on the information provided above."""
                 'scripture_filter': scripture_filter,
                 'search_results': [],
                 'llm_response': f"No documents found containing scripture reference: {scripture_filter}",
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time,
                 'sources_used': []
             }
         
@@ -436,7 +445,7 @@ Provide a comprehensive answer based on the information provided above."""
                 'scripture_filter': scripture_filter,
                 'search_results': [],
                 'llm_response': "No documents found meeting both filter criteria.",
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time,
                 'sources_used': []
             }
 
@@ -473,7 +482,7 @@ Provide a comprehensive answer based on the information provided above."""
                 logger.error(f"LLM response generation failed: {e}")
                 response_data['llm_response'] = "Error generating LLM response. Vector search results available."
 
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         response_data['execution_time'] = execution_time
 
         return response_data
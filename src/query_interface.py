@@ -10,7 +10,8 @@ from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.styles import Style
 from rich.console import Console
 from rich.table import Table
-from src import initialize_database, DocumentProcessor, DatabaseManager
+from src.initialize_database import initialize_database
+from src import DocumentProcessor, DatabaseManager
 
 # Command-line interface
 @click.command()
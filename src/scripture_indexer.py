@@ -8,19 +8,108 @@ import sqlite3
 import logging
 import re
 import json
-from typing import Dict, List, Set, Tuple, Optional
+import threading
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Optional
 from datetime import datetime
+from hashlib import blake2b
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator; the combined regex scans alone without it
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # optional; the json module produces the same encoding
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # optional; blake2b hashes the chunk digests instead
+    xxhash = None
 
 logger = logging.getLogger(__name__)
 
+# Characters of the previous chunk kept when scanning chunk by chunk, enough for
+# a reference split across chunks and the start of its sentence
+CHUNK_CARRY_CHARS = 200
+
+# Rebuilds of at least this many documents extract references in a process pool
+PARALLEL_REBUILD_MIN_DOCUMENTS = 32
+
+# Mixed into document content hashes; bump when extraction or normalization
+# changes so the next rebuild re-scans every document
+SCRIPTURE_EXTRACTION_VERSION = 1
+
+# Extraction-only indexer of each rebuild worker process
+_worker_indexer = None
+
+def _dumps_json(value) -> bytes:
+    """Serialize context snippets to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads_json(data):
+    """Deserialize stored context snippets, whether bytes or legacy TEXT"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _init_rebuild_worker():
+    """Build the extraction patterns once per worker process, without touching the database"""
+    global _worker_indexer
+    _worker_indexer = ScriptureIndexer.__new__(ScriptureIndexer)
+    _worker_indexer._init_extraction()
+
+def _extract_chunk_scriptures(chunks: List[str]) -> Dict[str, Dict]:
+    """Extract scripture references from a document's chunks in a worker process"""
+    return _worker_indexer.extract_scripture_references_iter(chunks)
+
 class ScriptureIndexer:
     """Extracts and indexes Bible scripture references from documents"""
     
     def __init__(self, metadata_db_path: str):
         self.metadata_db_path = metadata_db_path
-        self.book_patterns = self._load_book_patterns()
+        # Unchanged documents skipped by the last rebuild
+        self.last_rebuild_skipped = 0
+        self._init_extraction()
         self._init_scripture_index_table()
     
+    def _init_extraction(self):
+        """Build the book tables and compiled patterns used to extract references"""
+        self.book_patterns = self._load_book_patterns()
+        self._abbrev_to_book = {
+            abbrev.lower(): book_name
+            for book_name, abbreviations in self.book_patterns.items()
+            for abbrev in abbreviations
+        }
+        # Book tokens as usually written ("john", "John", "JOHN"), so most
+        # matches resolve without lowercasing the captured token
+        self._book_token_to_book = {
+            variant: book_name
+            for abbrev, book_name in self._abbrev_to_book.items()
+            for variant in (abbrev, abbrev.title(), abbrev.upper())
+        }
+        self._combined_re = re.compile(self._build_scripture_patterns(), re.IGNORECASE)
+        self._hyperscan_db = self._build_hyperscan_database()
+        self._hyperscan_local = threading.local()
+        
+        # Leading book token of a free-form reference such as a search query
+        self._book_prefix_re = re.compile(rf'\b(?P<book>{self._book_alternation()})\.?\s*', re.IGNORECASE)
+        self._sentence_separator_re = re.compile(r'[.!?]+')
+        self._digit_re = re.compile(r'\d')
+        
+        # Canonical book order gives each book a stable integer id
+        self._book_ids = {book_name: book_id for book_id, book_name in enumerate(self.book_patterns, 1)}
+        self._coordinates_re = re.compile(
+            r'(?P<book>.+?) (?P<chapter>\d+)(?::(?P<verse_start>\d+)(?:-(?P<verse_end>\d+))?)?'
+        )
+    
     def _load_book_patterns(self) -> Dict[str, List[str]]:
         """Load comprehensive Bible book name patterns and abbreviations"""
         return {
@@ -95,12 +184,27 @@ class ScriptureIndexer:
             'Revelation': ['revelation', 'rev', 'rv', 're']
         }
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a metadata database connection tuned for bulk indexing"""
+        conn = sqlite3.connect(self.metadata_db_path)
+        # WAL makes NORMAL sync safe: commits no longer fsync, only checkpoints do
+        conn.executescript('''
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+        ''')
+        return conn
+    
     def _init_scripture_index_table(self):
         """Initialize the scripture index table"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # WAL is persistent for the database file, so it only needs setting once
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Create scripture index table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS scripture_index (
@@ -108,11 +212,17 @@ class ScriptureIndexer:
                     document_id INTEGER NOT NULL,
                     context_snippets TEXT,
                     normalized_reference TEXT,
+                    book_id INTEGER,
+                    chapter INTEGER,
+                    verse_start INTEGER,
+                    verse_end INTEGER,
                     PRIMARY KEY (reference, document_id),
                     FOREIGN KEY (document_id) REFERENCES documents (id)
                 )
             ''')
             
+            self._migrate_reference_coordinates(cursor)
+            
             # Create indexes for performance
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_scripture_lookup 
@@ -124,10 +234,29 @@ class ScriptureIndexer:
                 ON scripture_index (normalized_reference)
             ''')
             
+            # Covers per-document lookups and the scripture_index side of the
+            # documents join, superseding the plain document_id index
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_document_scriptures 
-                ON scripture_index (document_id)
+                CREATE INDEX IF NOT EXISTS idx_si_cover 
+                ON scripture_index (document_id, normalized_reference, reference, context_snippets)
             ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_document_scriptures')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_bcv 
+                ON scripture_index (book_id, chapter, verse_start)
+            ''')
+            
+            # Content hash of each document as of its last rebuild
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scripture_index_hash (
+                    document_id INTEGER PRIMARY KEY,
+                    content_hash BLOB NOT NULL
+                )
+            ''')
+            
+            self._fts_enabled = self._init_scripture_fts(cursor)
+            self._init_scripture_counts(cursor)
             
             conn.commit()
             conn.close()
@@ -138,77 +267,293 @@ class ScriptureIndexer:
             logger.error(f"Failed to initialize scripture index table: {e}")
             raise
     
-    def _build_scripture_patterns(self) -> List[str]:
-        """Build comprehensive regex patterns for scripture references"""
-        patterns = []
+    def _migrate_reference_coordinates(self, cursor: sqlite3.Cursor):
+        """Add the integer book/chapter/verse columns to older tables and fill them in"""
+        cursor.execute("PRAGMA table_info(scripture_index)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'book_id' in columns:
+            return
         
-        # Create pattern for each book and its abbreviations
-        for book_name, abbreviations in self.book_patterns.items():
-            for abbrev in abbreviations:
-                # Escape special regex characters
-                escaped_abbrev = re.escape(abbrev)
-                
-                # Various patterns for different formats:
-                # 1. "John 3:16" or "Jn 3:16"
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+\d+:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*\b')
-                
-                # 2. "John 3 16" or "Jn 3 16" (space instead of colon)
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+\d+\s+\d+(?:-\d+)?\b')
-                
-                # 3. "John chapter 3 verse 16"
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+(?:chapter\s+)?\d+(?:\s+verse\s+|\s+v\.?\s+)\d+(?:-\d+)?\b')
-                
-                # 4. "John 3:16-20" (verse ranges)
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+\d+:\d+-\d+\b')
-                
-                # 5. "John 3:16, 20" (multiple verses)
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+\d+:\d+(?:,\s*\d+)*\b')
-                
-                # 6. "John 3:16-20, 25" (mixed ranges and individual verses)
-                patterns.append(rf'\b{escaped_abbrev}\.?\s+\d+:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*\b')
+        for column in ('book_id', 'chapter', 'verse_start', 'verse_end'):
+            cursor.execute(f"ALTER TABLE scripture_index ADD COLUMN {column} INTEGER")
         
-        return patterns
+        rows = cursor.execute(
+            "SELECT rowid, normalized_reference FROM scripture_index WHERE normalized_reference IS NOT NULL"
+        ).fetchall()
+        cursor.executemany('''
+            UPDATE scripture_index SET book_id = ?, chapter = ?, verse_start = ?, verse_end = ?
+            WHERE rowid = ?
+        ''', [
+            (*coordinates, rowid)
+            for rowid, normalized_ref in rows
+            for coordinates in (self._reference_coordinates(normalized_ref),)
+            if coordinates
+        ])
+    
+    def _init_scripture_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over references, returning False when FTS5 is unavailable"""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scripture_fts'")
+            exists = cursor.fetchone() is not None
+            
+            # External-content index: tokens only, rows stay in scripture_index.
+            # ':' and '-' are token characters so "3:16-20" stays one token
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS scripture_fts USING fts5(
+                    normalized_reference, reference,
+                    content='scripture_index', content_rowid='rowid',
+                    tokenize="unicode61 tokenchars ':-'"
+                )
+            ''')
+            
+            # Keep the index in sync with scripture_index
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS scripture_fts_insert AFTER INSERT ON scripture_index BEGIN
+                    INSERT INTO scripture_fts (rowid, normalized_reference, reference)
+                    VALUES (new.rowid, new.normalized_reference, new.reference);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS scripture_fts_delete AFTER DELETE ON scripture_index BEGIN
+                    INSERT INTO scripture_fts (scripture_fts, rowid, normalized_reference, reference)
+                    VALUES ('delete', old.rowid, old.normalized_reference, old.reference);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS scripture_fts_update AFTER UPDATE ON scripture_index BEGIN
+                    INSERT INTO scripture_fts (scripture_fts, rowid, normalized_reference, reference)
+                    VALUES ('delete', old.rowid, old.normalized_reference, old.reference);
+                    INSERT INTO scripture_fts (rowid, normalized_reference, reference)
+                    VALUES (new.rowid, new.normalized_reference, new.reference);
+                END
+            ''')
+            
+            # Index references stored before the FTS table existed
+            if not exists:
+                cursor.execute("INSERT INTO scripture_fts (scripture_fts) VALUES ('rebuild')")
+            return True
+            
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, scripture search will scan the index: {e}")
+            return False
+    
+    def _init_scripture_counts(self, cursor: sqlite3.Cursor):
+        """Create the per-reference row counts maintained by triggers for statistics"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scripture_counts'")
+        exists = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scripture_counts (
+                normalized_reference TEXT PRIMARY KEY,
+                doc_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scripture_counts_doc_count
+            ON scripture_counts (doc_count DESC)
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS scripture_counts_insert AFTER INSERT ON scripture_index
+            WHEN new.normalized_reference IS NOT NULL BEGIN
+                INSERT INTO scripture_counts (normalized_reference, doc_count)
+                VALUES (new.normalized_reference, 1)
+                ON CONFLICT (normalized_reference) DO UPDATE SET doc_count = doc_count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS scripture_counts_delete AFTER DELETE ON scripture_index
+            WHEN old.normalized_reference IS NOT NULL BEGIN
+                UPDATE scripture_counts SET doc_count = doc_count - 1
+                WHERE normalized_reference = old.normalized_reference;
+                DELETE FROM scripture_counts
+                WHERE normalized_reference = old.normalized_reference AND doc_count <= 0;
+            END
+        ''')
+        
+        # Count references stored before the table existed
+        if not exists:
+            cursor.execute('''
+                INSERT INTO scripture_counts (normalized_reference, doc_count)
+                SELECT normalized_reference, COUNT(*) FROM scripture_index
+                WHERE normalized_reference IS NOT NULL
+                GROUP BY normalized_reference
+            ''')
+    
+    def _fts_query(self, scripture_query: str, normalized_query: Optional[str]) -> Optional[str]:
+        """Build an FTS5 query matching either column by token prefix"""
+        clauses = []
+        for column, text in (('reference', scripture_query),
+                             ('normalized_reference', normalized_query or scripture_query)):
+            tokens = re.findall(r'[\w:-]+', text)
+            if tokens:
+                clauses.append(f'{column} : "{" ".join(tokens)}" *')
+        return ' OR '.join(clauses) if clauses else None
+    
+    def _book_alternation(self) -> str:
+        """Build a regex alternation of every book abbreviation"""
+        # Longest abbreviations first so "genesis" wins over "gen" and "ge"
+        abbreviations = sorted(self._abbrev_to_book, key=len, reverse=True)
+        return '|'.join(re.escape(abbrev) for abbrev in abbreviations)
+    
+    def _build_scripture_patterns(self) -> str:
+        """Build one regex matching a scripture reference for any book abbreviation"""
+        book_pattern = self._book_alternation()
+        # A trailing number never belongs to this reference when it starts the
+        # next one, as the ordinal in "John 3:16, 1 Corinthians 13:4" does
+        not_next_book = rf'(?!(?:{book_pattern})\.?\s+\d)'
+        
+        # Various layouts of the chapter/verse part, tried in order:
+        reference_pattern = '|'.join([
+            # 1. "John 3:16", "Jn 3:16-20" or "John 3:16-20, 25" (ranges and lists)
+            rf'\d+:\d+(?:-\d+)?(?:,\s*{not_next_book}\d+(?:-\d+)?)*',
+            # 2. "John 3 16" or "Jn 3 16" (space instead of colon)
+            rf'\d+\s+{not_next_book}\d+(?:-\d+)?',
+            # 3. "John chapter 3 verse 16"
+            r'(?:chapter\s+)?\d+(?:\s+verse\s+|\s+v\.?\s+)\d+(?:-\d+)?',
+        ])
+        
+        return rf'\b(?P<book>{book_pattern})\.?\s+(?P<ref>{reference_pattern})\b'
+    
+    def _build_hyperscan_database(self):
+        """Compile a Hyperscan database locating candidate reference starts.
+        
+        Each expression is a book abbreviation followed by the first digit of a
+        chapter, with no leading word boundary (unsupported in Unicode mode) and
+        whitespace widened to everything str.isspace() accepts. That is a
+        superset of what the combined regex accepts at a position, so Hyperscan
+        only proposes start offsets that the combined regex then verifies.
+        Returns None when Hyperscan is unavailable.
+        """
+        if hyperscan is None:
+            return None
+        
+        abbreviations = list(self._abbrev_to_book)
+        expressions = [
+            rf'{re.escape(abbrev)}\.?[\s\x1c-\x1f]+(?:chapter[\s\x1c-\x1f]+)?\d'.encode('utf-8')
+            for abbrev in abbreviations
+        ]
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+                      | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+            )
+            return database
+        except Exception as e:
+            logger.warning(f"Failed to compile Hyperscan database, using regex scan: {e}")
+            return None
+    
+    def _iter_reference_matches(self, text: str):
+        """Yield combined-regex matches in order, as finditer would"""
+        # Every reference has a chapter number, so text without a digit cannot
+        # match; one C-level search rejects it before the full scan
+        if not self._digit_re.search(text):
+            return
+        
+        if self._hyperscan_db is None:
+            yield from self._combined_re.finditer(text)
+            return
+        
+        # Scratch space cannot be shared between concurrent scans
+        scratch = getattr(self._hyperscan_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(self._hyperscan_db)
+        
+        data = text.encode('utf-8', 'surrogatepass')
+        candidate_starts = set()
+        self._hyperscan_db.scan(
+            data,
+            match_event_handler=lambda _id, start, _end, _flags, _context: candidate_starts.add(start),
+            scratch=scratch
+        )
+        
+        # Convert byte offsets to character offsets incrementally and verify each
+        # candidate with the combined regex, skipping ones inside a previous match
+        byte_offset = 0
+        char_offset = 0
+        resume_at = 0
+        for start in sorted(candidate_starts):
+            char_offset += len(data[byte_offset:start].decode('utf-8', 'surrogatepass'))
+            byte_offset = start
+            if char_offset < resume_at:
+                continue
+            match = self._combined_re.match(text, char_offset)
+            if match:
+                resume_at = match.end()
+                yield match
     
     def extract_scripture_references(self, text: str) -> Dict[str, Dict]:
         """Extract scripture references from text with context"""
         scripture_data = {}
-        patterns = self._build_scripture_patterns()
-        
-        # Split text into sentences for context
-        sentences = re.split(r'[.!?]+', text)
+        self._collect_scripture_references(text, scripture_data)
+        return self._finalize_scripture_data(scripture_data)
+    
+    def extract_scripture_references_iter(self, chunks: Iterable[str]) -> Dict[str, Dict]:
+        """Extract scripture references from a document one chunk at a time"""
+        scripture_data = {}
+        carry = ""
+        for chunk in chunks:
+            # Prefix the tail of the previous chunk so references and sentences
+            # straddling the boundary are still found; matches lying entirely in
+            # the tail were already counted with the previous chunk
+            text = f"{carry}\n\n{chunk}" if carry else chunk
+            self._collect_scripture_references(text, scripture_data, len(text) - len(chunk))
+            carry = chunk[-CHUNK_CARRY_CHARS:]
+        return self._finalize_scripture_data(scripture_data)
+    
+    def _collect_scripture_references(self, text: str, scripture_data: Dict[str, Dict], new_text_start: int = 0):
+        """Add references found in text to scripture_data, skipping matches ending before new_text_start"""
+        sentence_starts = None
         
-        # Search for all patterns
-        for pattern in patterns:
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            
-            for match in matches:
-                reference = match.group().strip()
-                normalized_ref = self._normalize_reference(reference)
+        # One scan finds every reference, whichever book and layout it uses
+        for match in self._iter_reference_matches(text):
+            if match.end() <= new_text_start:
+                continue
+            
+            reference = match.group().strip()
+            normalized_ref = self._normalize_book_reference(match.group('book'), match.group('ref'))
+            
+            if normalized_ref:
+                # Sentence boundaries for context, as offsets between [.!?]+ separators,
+                # built only once the text is known to contain a reference
+                if sentence_starts is None:
+                    sentence_starts = [0]
+                    sentence_ends = []
+                    for separator in self._sentence_separator_re.finditer(text):
+                        sentence_ends.append(separator.start())
+                        sentence_starts.append(separator.end())
+                    sentence_ends.append(len(text))
                 
-                if normalized_ref:
-                    # Find context sentences
-                    context_snippets = []
-                    match_pos = match.start()
-                    
-                    # Find sentences containing this reference
-                    for sentence in sentences:
-                        if reference.lower() in sentence.lower():
-                            context_snippets.append(sentence.strip())
-                    
-                    # Store or update reference data
-                    if normalized_ref not in scripture_data:
-                        scripture_data[normalized_ref] = {
-                            'original_reference': reference,
-                            'context_snippets': [],
-                            'count': 0
-                        }
-                    
-                    scripture_data[normalized_ref]['count'] += 1
-                    scripture_data[normalized_ref]['context_snippets'].extend(context_snippets[:2])
-        
-        # Deduplicate and limit context snippets
+                # Context is the sentence containing the reference, extended to the
+                # following sentences when the reference itself contains a period
+                first = bisect_right(sentence_starts, match.start()) - 1
+                last = bisect_right(sentence_starts, match.end() - 1) - 1
+                context = text[sentence_starts[first]:sentence_ends[last]].strip()
+                
+                # Store or update reference data
+                if normalized_ref not in scripture_data:
+                    scripture_data[normalized_ref] = {
+                        'original_reference': reference,
+                        'context_snippets': {},
+                        'count': 0
+                    }
+                
+                ref_data = scripture_data[normalized_ref]
+                ref_data['count'] += 1
+                
+                # Keep the first three distinct snippets; dict keys preserve their order
+                snippets = ref_data['context_snippets']
+                if len(snippets) < 3:
+                    snippets[context] = None
+    
+    def _finalize_scripture_data(self, scripture_data: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Convert the collected context snippets to lists for storage"""
         for ref_data in scripture_data.values():
-            ref_data['context_snippets'] = list(set(ref_data['context_snippets']))[:3]
+            ref_data['context_snippets'] = list(ref_data['context_snippets'])
         
         return scripture_data
     
@@ -216,69 +561,129 @@ class ScriptureIndexer:
         """Normalize scripture reference to standard format"""
         try:
             # Clean up the reference
-            ref = re.sub(r'[,.]$', '', reference.strip())
+            ref = reference.strip()
+            if ref.endswith((',', '.')):
+                ref = ref[:-1]
             
             # Find the book name
-            for book_name, abbreviations in self.book_patterns.items():
-                for abbrev in abbreviations:
-                    pattern = rf'\b{re.escape(abbrev)}\.?\s*'
-                    if re.match(pattern, ref, re.IGNORECASE):
-                        # Extract chapter and verse
-                        remainder = re.sub(pattern, '', ref, flags=re.IGNORECASE).strip()
-                        
-                        # Handle different formats
-                        if ':' in remainder:
-                            # "3:16" format
-                            return f"{book_name} {remainder}"
-                        elif ' ' in remainder:
-                            # "3 16" format - convert to "3:16"
-                            parts = remainder.split()
-                            if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
-                                return f"{book_name} {parts[0]}:{parts[1]}"
-                        elif remainder.isdigit():
-                            # Just chapter number
-                            return f"{book_name} {remainder}"
+            match = self._book_prefix_re.match(ref)
+            if not match:
+                return None
             
-            return None
+            return self._normalize_book_reference(match.group('book'), ref[match.end():])
             
         except Exception as e:
             logger.debug(f"Failed to normalize reference '{reference}': {e}")
             return None
     
-    def index_document_scriptures(self, document_id: int, document_content: str, filename: str = None) -> bool:
-        """Index scripture references for a single document"""
+    def _normalize_book_reference(self, book_token: str, remainder: str) -> Optional[str]:
+        """Normalize a reference whose book token and chapter/verse part are already split"""
+        book_name = self._book_token_to_book.get(book_token)
+        if book_name is None:
+            book_name = self._abbrev_to_book.get(book_token.lower())
+        if book_name is None:
+            return None
+        
+        # Extract chapter and verse
+        remainder = remainder.strip()
+        
+        # Handle different formats
+        if ':' in remainder:
+            # "3:16" format
+            return f"{book_name} {remainder}"
+        if remainder.isdigit():
+            # Just chapter number
+            return f"{book_name} {remainder}"
+        
+        # "3 16" format, separated by any whitespace - convert to "3:16"
+        parts = remainder.split()
+        if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+            return f"{book_name} {parts[0]}:{parts[1]}"
+        
+        return None
+    
+    def _reference_coordinates(self, normalized_ref: str) -> Optional[Tuple[int, int, Optional[int], Optional[int]]]:
+        """Parse a normalized reference into (book_id, chapter, verse_start, verse_end).
+        
+        Verses are None for chapter-only references; lists such as "3:16, 20"
+        keep only their leading verse or range.
+        """
+        match = self._coordinates_re.match(normalized_ref)
+        if not match:
+            return None
+        
+        book_id = self._book_ids.get(match.group('book'))
+        if book_id is None:
+            return None
+        
+        verse_start = match.group('verse_start')
+        if verse_start is None:
+            return book_id, int(match.group('chapter')), None, None
+        
+        verse_end = match.group('verse_end') or verse_start
+        return book_id, int(match.group('chapter')), int(verse_start), int(verse_end)
+    
+    def index_document_scriptures(self, document_id: int, document_content: str, filename: str = None,
+                                  conn: Optional[sqlite3.Connection] = None) -> bool:
+        """Index scripture references for a single document.
+        
+        When a connection is passed in, the caller owns it and commits the changes.
+        """
+        # Use filename for logging if provided, otherwise fall back to document_id
+        display_name = filename if filename else f"document {document_id}"
+        
         try:
             # Extract scripture references
             scriptures = self.extract_scripture_references(document_content)
+            return self._store_document_scriptures(document_id, scriptures, display_name, conn)
             
-            # Use filename for logging if provided, otherwise fall back to document_id
-            display_name = filename if filename else f"document {document_id}"
-            
+        except Exception as e:
+            logger.error(f"Failed to index scriptures for {display_name}: {e}")
+            return False
+    
+    def _iter_scripture_rows(self, scriptures: Dict[str, Dict]) -> Iterator[Tuple[str, str, Any]]:
+        """Yield (normalized reference, original reference, context JSON) rows for storage"""
+        for normalized_ref, data in scriptures.items():
+            yield normalized_ref, data['original_reference'], _dumps_json(data['context_snippets'])
+    
+    def _store_document_scriptures(self, document_id: int, scriptures: Dict[str, Dict], display_name: str,
+                                   conn: Optional[sqlite3.Connection] = None) -> bool:
+        """Replace a document's stored scripture references"""
+        try:
             if not scriptures:
                 logger.info(f"No scripture references found in {display_name}")
                 return True
             
             # Store in database
-            conn = sqlite3.connect(self.metadata_db_path)
-            cursor = conn.cursor()
-            
-            # Clear existing scripture references for this document
-            cursor.execute(
-                "DELETE FROM scripture_index WHERE document_id = ?",
-                (document_id,)
-            )
-            
-            # Insert new scripture references
-            for normalized_ref, data in scriptures.items():
-                context_json = json.dumps(data['context_snippets'])
-                cursor.execute('''
+            own_connection = conn is None
+            if own_connection:
+                conn = self._connect()
+            try:
+                cursor = conn.cursor()
+                
+                # Clear existing scripture references for this document
+                cursor.execute(
+                    "DELETE FROM scripture_index WHERE document_id = ?",
+                    (document_id,)
+                )
+                
+                # Insert new scripture references, serializing each row as it is consumed
+                cursor.executemany('''
                     INSERT INTO scripture_index 
-                    (reference, document_id, context_snippets, normalized_reference)
-                    VALUES (?, ?, ?, ?)
-                ''', (data['original_reference'], document_id, context_json, normalized_ref))
-            
-            conn.commit()
-            conn.close()
+                    (reference, document_id, context_snippets, normalized_reference,
+                     book_id, chapter, verse_start, verse_end)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    (original_reference, document_id, context_json, normalized_ref,
+                     *(self._reference_coordinates(normalized_ref) or (None, None, None, None)))
+                    for normalized_ref, original_reference, context_json in self._iter_scripture_rows(scriptures)
+                ))
+                
+                if own_connection:
+                    conn.commit()
+            finally:
+                if own_connection:
+                    conn.close()
             
             logger.info(f"Indexed {len(scriptures)} scripture references for {display_name}")
             return True
@@ -290,15 +695,47 @@ class ScriptureIndexer:
     def search_by_scripture(self, scripture_query: str) -> List[Dict]:
         """Search for documents containing specific scripture references"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Normalize the query
             normalized_query = self._normalize_reference(scripture_query)
             
+            coordinates = self._reference_coordinates(normalized_query) if normalized_query else None
+            
             # Search by both original and normalized references
             # If normalization failed (returns None), still search in both fields
-            if normalized_query:
+            if coordinates:
+                # Integer lookup on book and chapter; a verse query matches every
+                # stored verse range overlapping it
+                book_id, chapter, verse_start, verse_end = coordinates
+                verse_clause = "" if verse_start is None else "AND si.verse_start <= ? AND si.verse_end >= ?"
+                verse_params = () if verse_start is None else (verse_end, verse_start)
+                cursor.execute(f'''
+                    SELECT si.document_id, d.filename, d.filepath, 
+                           si.reference, si.normalized_reference, si.context_snippets
+                    FROM scripture_index si
+                    JOIN documents d ON si.document_id = d.id
+                    WHERE si.book_id = ? AND si.chapter = ? {verse_clause}
+                    ORDER BY d.filename
+                ''', (book_id, chapter, *verse_params))
+            elif self._fts_enabled:
+                # Token-prefix match through the inverted index instead of a
+                # leading-wildcard LIKE scan over every row
+                fts_query = self._fts_query(scripture_query, normalized_query)
+                if fts_query is None:
+                    conn.close()
+                    return []
+                cursor.execute('''
+                    SELECT si.document_id, d.filename, d.filepath, 
+                           si.reference, si.normalized_reference, si.context_snippets
+                    FROM scripture_fts f
+                    JOIN scripture_index si ON si.rowid = f.rowid
+                    JOIN documents d ON si.document_id = d.id
+                    WHERE scripture_fts MATCH ?
+                    ORDER BY d.filename
+                ''', (fts_query,))
+            elif normalized_query:
                 cursor.execute('''
                     SELECT si.document_id, d.filename, d.filepath, 
                            si.reference, si.normalized_reference, si.context_snippets
@@ -330,7 +767,7 @@ class ScriptureIndexer:
                     'filepath': row[2],
                     'reference': row[3],
                     'normalized_reference': row[4],
-                    'context_snippets': json.loads(row[5]) if row[5] else []
+                    'context_snippets': _loads_json(row[5]) if row[5] else []
                 })
             
             return formatted_results
@@ -342,7 +779,7 @@ class ScriptureIndexer:
     def get_document_scriptures(self, document_id: int) -> List[Dict]:
         """Get all scripture references for a specific document"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -360,7 +797,7 @@ class ScriptureIndexer:
                 scriptures.append({
                     'reference': row[0],
                     'normalized_reference': row[1],
-                    'context_snippets': json.loads(row[2]) if row[2] else []
+                    'context_snippets': _loads_json(row[2]) if row[2] else []
                 })
             
             return scriptures
@@ -372,22 +809,17 @@ class ScriptureIndexer:
     def get_scripture_statistics(self) -> Dict:
         """Get statistics about scripture references in the database"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            # Total scripture references
-            cursor.execute("SELECT COUNT(*) FROM scripture_index")
-            total_references = cursor.fetchone()[0]
-            
-            # Unique normalized references
-            cursor.execute("SELECT COUNT(DISTINCT normalized_reference) FROM scripture_index")
-            unique_references = cursor.fetchone()[0]
+            # Total and unique normalized references, from the trigger-maintained counts
+            cursor.execute("SELECT COALESCE(SUM(doc_count), 0), COUNT(*) FROM scripture_counts")
+            total_references, unique_references = cursor.fetchone()
             
             # Top scripture references
             cursor.execute('''
-                SELECT normalized_reference, COUNT(*) as doc_count
-                FROM scripture_index
-                GROUP BY normalized_reference
+                SELECT normalized_reference, doc_count
+                FROM scripture_counts
                 ORDER BY doc_count DESC
                 LIMIT 20
             ''')
@@ -408,48 +840,151 @@ class ScriptureIndexer:
             logger.error(f"Failed to get scripture statistics: {e}")
             return {}
     
-    def rebuild_scripture_index_for_all_documents(self) -> bool:
-        """Rebuild the scripture index for all documents using document chunks"""
+    def rebuild_scripture_index_for_all_documents(self, force: bool = False) -> bool:
+        """Rebuild the scripture index for all documents using document chunks.
+        
+        Documents whose chunks are unchanged since the last rebuild are skipped
+        unless force is set; their number is left in last_rebuild_skipped.
+        """
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
-            cursor = conn.cursor()
+            # One connection and one transaction for the whole rebuild
+            conn = self._connect()
             
-            # Get all documents with filename
-            cursor.execute("SELECT id, filename FROM documents")
-            documents = cursor.fetchall()
-            
-            success_count = 0
-            total_count = len(documents)
+            total_count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
             
             logger.info(f"Starting to rebuild scripture index for {total_count} documents...")
             
-            for doc_id, filename in documents:
-                try:
-                    # Get all chunks for this document
-                    cursor.execute(
-                        "SELECT chunk_text FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
-                        (doc_id,)
-                    )
-                    chunks = cursor.fetchall()
-                    
-                    if chunks:
-                        # Combine all chunks for this document
-                        combined_content = "\n\n".join([chunk[0] for chunk in chunks])
-                        
-                        # Index the document using the extracted text content with filename for better logging
-                        if self.index_document_scriptures(doc_id, combined_content, filename):
-                            success_count += 1
-                    else:
-                        logger.warning(f"No chunks found for {filename or f'document {doc_id}'}")
-                        
-                except Exception as e:
-                    logger.error(f"Failed to process {filename or f'document {doc_id}'}: {e}")
+            stored_hashes = {} if force else dict(
+                conn.execute("SELECT document_id, content_hash FROM scripture_index_hash")
+            )
+            
+            workers = os.cpu_count() or 1
+            if workers < 2 or total_count - len(stored_hashes) < PARALLEL_REBUILD_MIN_DOCUMENTS:
+                success_count, skipped_count = self._rebuild_sequential(conn, stored_hashes)
+            else:
+                success_count, skipped_count = self._rebuild_parallel(conn, workers, stored_hashes)
+            self.last_rebuild_skipped = skipped_count
                     
+            conn.commit()
+            
+            # Refresh planner statistics after the bulk rewrite
+            conn.execute('ANALYZE')
             conn.close()
             
-            logger.info(f"Rebuilt scripture index for {success_count}/{total_count} documents")
+            logger.info(f"Rebuilt scripture index for {success_count}/{total_count} documents "
+                        f"({skipped_count} unchanged documents skipped)")
             return success_count == total_count
             
         except Exception as e:
             logger.error(f"Failed to rebuild scripture index: {e}")
             return False
+    
+    def _document_content_hash(self, cursor: sqlite3.Cursor, doc_id: int) -> bytes:
+        """Hash a document's ordered chunk hashes, so unchanged content is detected without reading it"""
+        hasher = xxhash.xxh3_64() if xxhash is not None else blake2b(digest_size=8)
+        hasher.update(str(SCRIPTURE_EXTRACTION_VERSION).encode('ascii'))
+        cursor.execute(
+            "SELECT chunk_hash FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
+            (doc_id,)
+        )
+        for (chunk_hash,) in cursor:
+            hasher.update(b'\0' + (chunk_hash or '').encode('ascii'))
+        return hasher.digest()
+    
+    def _store_content_hash(self, conn: sqlite3.Connection, doc_id: int, content_hash: bytes):
+        """Record the content hash a document was indexed from"""
+        conn.execute(
+            "INSERT OR REPLACE INTO scripture_index_hash (document_id, content_hash) VALUES (?, ?)",
+            (doc_id, content_hash)
+        )
+    
+    def _rebuild_sequential(self, conn: sqlite3.Connection, stored_hashes: Dict[int, bytes]) -> Tuple[int, int]:
+        """Re-index every changed document in this process, returning the numbers up to date and skipped"""
+        success_count = 0
+        skipped_count = 0
+        cursor = conn.cursor()
+        
+        # Stream documents with their filename from a separate cursor
+        for doc_id, filename in conn.execute("SELECT id, filename FROM documents"):
+            try:
+                content_hash = self._document_content_hash(cursor, doc_id)
+                if stored_hashes.get(doc_id) == content_hash:
+                    success_count += 1
+                    skipped_count += 1
+                    continue
+                
+                # Get all chunks for this document
+                cursor.execute(
+                    "SELECT chunk_text FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
+                    (doc_id,)
+                )
+                first_chunk = cursor.fetchone()
+                
+                if first_chunk:
+                    # Scan the chunks as they stream from the cursor instead of
+                    # joining the whole document into one string
+                    chunks = chain((first_chunk[0],), (row[0] for row in cursor))
+                    scriptures = self.extract_scripture_references_iter(chunks)
+                    
+                    display_name = filename or f"document {doc_id}"
+                    if self._store_document_scriptures(doc_id, scriptures, display_name, conn=conn):
+                        self._store_content_hash(conn, doc_id, content_hash)
+                        success_count += 1
+                else:
+                    logger.warning(f"No chunks found for {filename or f'document {doc_id}'}")
+                    
+            except Exception as e:
+                logger.error(f"Failed to process {filename or f'document {doc_id}'}: {e}")
+        
+        return success_count, skipped_count
+    
+    def _rebuild_parallel(self, conn: sqlite3.Connection, workers: int,
+                          stored_hashes: Dict[int, bytes]) -> Tuple[int, int]:
+        """Extract references of changed documents in worker processes and store them on this connection"""
+        success_count = 0
+        skipped_count = 0
+        cursor = conn.cursor()
+        pending = deque()
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rebuild_worker) as executor:
+            for doc_id, filename in conn.execute("SELECT id, filename FROM documents"):
+                content_hash = self._document_content_hash(cursor, doc_id)
+                if stored_hashes.get(doc_id) == content_hash:
+                    success_count += 1
+                    skipped_count += 1
+                    continue
+                
+                display_name = filename or f"document {doc_id}"
+                cursor.execute(
+                    "SELECT chunk_text FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
+                    (doc_id,)
+                )
+                chunks = [row[0] for row in cursor]
+                if not chunks:
+                    logger.warning(f"No chunks found for {display_name}")
+                    continue
+                
+                pending.append((doc_id, display_name, content_hash,
+                                executor.submit(_extract_chunk_scriptures, chunks)))
+                
+                # Bound the documents held in memory while the workers catch up
+                if len(pending) >= workers * 2:
+                    success_count += self._store_rebuild_result(conn, *pending.popleft())
+            
+            while pending:
+                success_count += self._store_rebuild_result(conn, *pending.popleft())
+        
+        return success_count, skipped_count
+    
+    def _store_rebuild_result(self, conn: sqlite3.Connection, doc_id: int, display_name: str,
+                              content_hash: bytes, future) -> int:
+        """Store one worker's extraction result, returning 1 on success"""
+        try:
+            scriptures = future.result()
+            if not self._store_document_scriptures(doc_id, scriptures, display_name, conn=conn):
+                return 0
+            self._store_content_hash(conn, doc_id, content_hash)
+            return 1
+        except Exception as e:
+            logger.error(f"Failed to process {display_name}: {e}")
+            return 0
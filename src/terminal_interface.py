@@ -5,34 +5,47 @@ Enhanced Terminal Interface for Document Database System
 
 import os
 import sys
-import yaml
+import time
+import queue
+import threading
 import logging
 import click
 from pathlib import Path
 from datetime import datetime
-from prompt_toolkit import PromptSession
-from prompt_toolkit.shortcuts import confirm
-from prompt_toolkit.styles import Style
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.history import FileHistory
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.text import Text
-from rich.progress import track
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.initialize_database import initialize_database
 from src.query_engine import QueryEngine
-from src.database_config import add_database_args, handle_database_selection, get_database_config, DatabaseConfig
+from src.passage_extraction import extract_full_content
+from src.database_config import add_database_args, handle_database_selection, get_database_config, DatabaseConfig, load_yaml_config
+
+# Seconds database statistics are reused between banner and stats redraws
+STATS_CACHE_TTL = 30
+
+# Startup banner body, filled from the database statistics
+_BANNER_TEMPLATE = """
+📚 Documents: {document_count}
+📄 Chunks: {chunk_count}
+🔍 Vectors: {vector_count}
+💾 Total Size: {total_file_size} bytes
+
+Commands:
+• Type your query to search documents
+• 'history' - View recent queries  
+• 'stats' - Show database statistics
+• 'help' - Show this help
+• 'exit' or 'quit' - Exit application
+        """
 
 class TerminalInterface:
     """Interactive terminal interface for document database queries"""
     
-    def __init__(self, auto_save=True, use_ai=True):
+    def __init__(self, auto_save=True, use_ai=True, interactive=True):
         self.console = Console()
         self.config = None
         self.db_manager = None
@@ -40,18 +53,56 @@ class TerminalInterface:
         self.session = None
         self.auto_save = auto_save
         self.use_ai = use_ai
+        self._daily_fd = None
+        self._daily_path = None
+        self._daily_needs_header = False
+        self._stats_cache = None
+        self._show_sources_pref = 'ask'
+        
+        # Daily results are written by a background thread so the prompt
+        # returns without waiting on disk I/O
+        self._writer_q = queue.Queue()
+        # Daily file names the writer failed to append to, reported at the next prompt
+        self._writer_failures = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name='daily-results-writer', daemon=True)
+        self._writer_thread.start()
+        
+        # REPL commands matched exactly, and by prefix with the argument after it
+        self._cmd_table = {
+            'help': self.show_help,
+            'history': self.show_history,
+            'stats': self.show_stats,
+            'clear': self.clear_screen,
+            'scripture-stats': self.show_scripture_stats,
+            'concept-stats': self.show_concept_stats,
+            'sources on': lambda: self.set_sources_preference('on'),
+            'sources off': lambda: self.set_sources_preference('off'),
+            'sources ask': lambda: self.set_sources_preference('ask'),
+        }
+        self._prefix_cmds = (
+            ('scripture:', self.process_scripture_query),
+            ('concept:', self.process_concept_query),
+        )
         
         # Load configuration and initialize
         self._load_config()
         self._initialize_components()
-        self._setup_prompt_session()
+        
+        # YAML reads unquoted on/off as booleans
+        show_sources = self.config.get('terminal', {}).get('show_sources', 'ask')
+        if isinstance(show_sources, bool):
+            show_sources = 'on' if show_sources else 'off'
+        self._show_sources_pref = show_sources if show_sources in ('on', 'off', 'ask') else 'ask'
+        
+        # Single-query mode never prompts, so it skips loading prompt_toolkit
+        if interactive:
+            self._setup_prompt_session()
     
     def _load_config(self):
-        """Load configuration from config.yaml"""
+        """Load configuration from config.yaml, via its JSON cache when that is up to date"""
         try:
             config_path = Path(__file__).parent.parent / 'config.yaml'
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_yaml_config(config_path)
         except Exception as e:
             self.console.print(f"[red]Error loading configuration: {e}[/red]")
             sys.exit(1)
@@ -67,6 +118,12 @@ class TerminalInterface:
     
     def _setup_prompt_session(self):
         """Setup prompt session with history and styling"""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.styles import Style
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.formatted_text import HTML
+        
         history_file = self.config['terminal']['history_file']
         
         style = Style.from_dict({
@@ -81,25 +138,20 @@ class TerminalInterface:
             auto_suggest=AutoSuggestFromHistory(),
             style=style
         )
+        
+        # Parsed once and reused for every prompt
+        self._prompt_text = HTML('<prompt>Query</prompt> <bracket>[</bracket><path>DocDB</path><bracket>]</bracket><pound>></pound> ')
+    
+    def _get_database_stats(self) -> dict:
+        """Return database statistics, re-querying at most every STATS_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._stats_cache is None or now - self._stats_cache[0] >= STATS_CACHE_TTL:
+            self._stats_cache = (now, self.db_manager.get_database_stats())
+        return self._stats_cache[1]
     
     def show_banner(self):
         """Display application banner"""
-        banner_text = Text("Document Database Query System", style="bold blue")
-        stats = self.db_manager.get_database_stats()
-        
-        info_text = f"""
-📚 Documents: {stats['document_count']}
-📄 Chunks: {stats['chunk_count']}
-🔍 Vectors: {stats['vector_count']}
-💾 Total Size: {stats['total_file_size']} bytes
-
-Commands:
-• Type your query to search documents
-• 'history' - View recent queries  
-• 'stats' - Show database statistics
-• 'help' - Show this help
-• 'exit' or 'quit' - Exit application
-        """
+        info_text = _BANNER_TEMPLATE.format_map(self._get_database_stats())
         
         panel = Panel(info_text, title="[bold blue]Document Database[/bold blue]", border_style="blue")
         self.console.print(panel)
@@ -108,42 +160,44 @@ Commands:
         """Main interactive loop"""
         self.show_banner()
         
+        try:
+            self._run_loop()
+        finally:
+            # Queued results are flushed however the loop ends
+            self._stop_writer()
+            self._report_write_failures()
+        self.console.print("\n[yellow]Goodbye![/yellow]")
+    
+    def _run_loop(self):
+        """Read and dispatch commands until the user exits"""
         while True:
             try:
+                self._report_write_failures()
+                
                 # Get user input
-                query = self.session.prompt(
-                    HTML('<prompt>Query</prompt> <bracket>[</bracket><path>DocDB</path><bracket>]</bracket><pound>></pound> ')
-                ).strip()
+                query = self.session.prompt(self._prompt_text).strip()
                 
                 if not query:
                     continue
                 
                 # Handle special commands
-                if query.lower() in ['exit', 'quit', 'q']:
+                cmd = query.lower()
+                if cmd in ('exit', 'quit', 'q'):
                     break
-                elif query.lower() == 'help':
-                    self.show_help()
-                elif query.lower() == 'history':
-                    self.show_history()
-                elif query.lower() == 'stats':
-                    self.show_stats()
-                elif query.lower() == 'clear':
-                    os.system('clear' if os.name == 'posix' else 'cls')
-                elif query.lower().startswith('scripture:'):
-                    # Scripture search command
-                    scripture_ref = query[10:].strip()
-                    self.process_scripture_query(scripture_ref)
-                elif query.lower() == 'scripture-stats':
-                    self.show_scripture_stats()
-                elif query.lower().startswith('concept:'):
-                    # Theological concept search command
-                    concept = query[8:].strip()
-                    self.process_concept_query(concept)
-                elif query.lower() == 'concept-stats':
-                    self.show_concept_stats()
+                
+                handler = self._cmd_table.get(cmd)
+                if handler:
+                    handler()
+                    continue
+                
+                # Scripture and theological concept search commands
+                for prefix, prefix_handler in self._prefix_cmds:
+                    if cmd.startswith(prefix):
+                        prefix_handler(query[len(prefix):].strip())
+                        break
                 else:
                     # Check if it's a scripture filter query
-                    if ' scripture:' in query.lower():
+                    if ' scripture:' in cmd:
                         self.process_combined_query(query)
                     else:
                         # Process regular query
@@ -153,8 +207,6 @@ Commands:
                 continue
             except EOFError:
                 break
-        
-        self.console.print("\n[yellow]Goodbye![/yellow]")
     
     def process_query(self, query: str):
         """Process a user query"""
@@ -168,12 +220,15 @@ Commands:
         except:
             use_llm = False
         
-        # Ask if user wants sources shown
-        show_sources = False
-        try:
-            show_sources = confirm("Show document sources? (y/n)")
-        except:
-            show_sources = False
+        # Ask if user wants sources shown, remembering the answer for the session
+        if self._show_sources_pref == 'ask':
+            try:
+                from prompt_toolkit.shortcuts import confirm
+                self._show_sources_pref = 'on' if confirm("Show document sources? (y/n)") else 'off'
+                self.console.print("[dim]Use 'sources on', 'sources off' or 'sources ask' to change this[/dim]")
+            except:
+                pass
+        show_sources = self._show_sources_pref == 'on'
         
         # Execute query
         with self.console.status("[bold green]Processing query...") as status:
@@ -201,74 +256,7 @@ Commands:
     
     def _extract_full_content(self, content: str, query: str) -> str:
         """Extract full sentences or paragraphs containing the query context"""
-        import re
-        
-        # First try to split by paragraphs (double newlines)
-        paragraphs = re.split(r'\n\s*\n', content)
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        
-        # Find paragraphs containing query terms
-        query_words = [word.lower() for word in query.split() if len(word) > 2]  # Skip short words
-        relevant_paragraphs = []
-        
-        for paragraph in paragraphs:
-            paragraph_lower = paragraph.lower()
-            # Count how many query words are in this paragraph
-            word_matches = sum(1 for word in query_words if word in paragraph_lower)
-            if word_matches > 0:
-                relevant_paragraphs.append((paragraph, word_matches))
-        
-        if relevant_paragraphs:
-            # Sort by number of matching words and take the best
-            relevant_paragraphs.sort(key=lambda x: x[1], reverse=True)
-            best_paragraph = relevant_paragraphs[0][0]
-            
-            # If paragraph is reasonable length, return it as is
-            if len(best_paragraph) <= 500:
-                return best_paragraph
-            else:
-                # If too long, try to extract relevant sentences from the paragraph
-                sentences = re.split(r'[.!?]+', best_paragraph)
-                sentences = [s.strip() for s in sentences if s.strip()]
-                
-                relevant_sentences = []
-                for sentence in sentences:
-                    sentence_lower = sentence.lower()
-                    word_matches = sum(1 for word in query_words if word in sentence_lower)
-                    if word_matches > 0:
-                        relevant_sentences.append((sentence, word_matches))
-                
-                if relevant_sentences:
-                    # Take the top 2-3 most relevant sentences
-                    relevant_sentences.sort(key=lambda x: x[1], reverse=True)
-                    top_sentences = [s[0] for s in relevant_sentences[:3]]
-                    return '. '.join(top_sentences) + '.'
-                else:
-                    # Fallback to first part of paragraph
-                    return best_paragraph[:400] + "..."
-        
-        # If no paragraphs match, try sentences from the whole content
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        relevant_sentences = []
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            word_matches = sum(1 for word in query_words if word in sentence_lower)
-            if word_matches > 0:
-                relevant_sentences.append((sentence, word_matches))
-        
-        if relevant_sentences:
-            # Sort by relevance and take top sentences
-            relevant_sentences.sort(key=lambda x: x[1], reverse=True)
-            top_sentences = [s[0] for s in relevant_sentences[:2]]
-            return '. '.join(top_sentences) + '.'
-        
-        # Fallback to beginning of content
-        if len(content) <= 300:
-            return content
-        else:
-            return content[:300] + "..."
+        return extract_full_content(content, query)
     
     def save_results(self, response: dict):
         """Save query results to daily file"""
@@ -276,45 +264,74 @@ Commands:
         filename = f"queries_{date_str}.txt"
         output_path = Path(self.config['output']['default_output_folder']) / filename
         
-        try:
-            success = self._append_to_daily_file(response, str(output_path))
-            if success:
-                self.console.print(f"[green]Results saved to:[/green] {filename}")
-            else:
-                self.console.print("[red]Failed to save results[/red]")
-        except Exception as e:
-            self.console.print(f"[red]Error saving results: {e}[/red]")
+        # The writer thread appends in the background; failures are reported
+        # before the next prompt
+        self._writer_q.put((response, str(output_path)))
+        self.console.print(f"[green]Results queued for:[/green] {filename}")
+    
+    def _writer_loop(self):
+        """Append queued results to the daily file until the stop sentinel arrives"""
+        while True:
+            item = self._writer_q.get()
+            if item is None:
+                break
+            if not self._append_to_daily_file(*item):
+                self._writer_failures.put(Path(item[1]).name)
+        self._close_daily_file()
+    
+    def _stop_writer(self):
+        """Flush queued results and stop the writer thread"""
+        self._writer_q.put(None)
+        self._writer_thread.join(timeout=5)
+    
+    def _report_write_failures(self):
+        """Print results the writer thread failed to save since the last report"""
+        while True:
+            try:
+                filename = self._writer_failures.get_nowait()
+            except queue.Empty:
+                return
+            self.console.print(f"[red]Failed to save results to:[/red] {filename}")
     
     def _append_to_daily_file(self, response_data: dict, file_path: str) -> bool:
         """Append query results to daily file"""
         try:
-            # Ensure output directory exists
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            # Keep the day's file open; a new date means a new path
+            if file_path != self._daily_path:
+                self._close_daily_file()
+                Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+                self._daily_fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                self._daily_path = file_path
+                self._daily_needs_header = os.fstat(self._daily_fd).st_size == 0
             
-            # Check if file exists to determine if we need a header
-            file_exists = Path(file_path).exists()
+            parts = []
             
-            with open(file_path, 'a', encoding='utf-8') as f:
-                # Add date header for new files
-                if not file_exists:
-                    f.write(f"Document Database Query Log - {datetime.now().strftime('%Y-%m-%d')}\n")
-                    f.write("=" * 80 + "\n\n")
-                
-                # Add timestamp and query
-                timestamp = datetime.now().strftime('%H:%M:%S')
-                f.write(f"[{timestamp}] Query: {response_data['query']}\n")
-                f.write(f"Execution Time: {response_data['execution_time']:.3f} seconds\n")
-                f.write("-" * 60 + "\n")
-                
-                # Add AI response if available
-                if response_data.get('llm_response'):
-                    f.write("AI Response:\n")
-                    f.write(response_data['llm_response'])
-                    f.write("\n")
-                else:
-                    f.write("No AI response generated.\n")
-                
-                f.write("\n" + "=" * 80 + "\n\n")
+            # Add date header for new files
+            if self._daily_needs_header:
+                parts.append(f"Document Database Query Log - {datetime.now().strftime('%Y-%m-%d')}\n")
+                parts.append("=" * 80 + "\n\n")
+            
+            # Add timestamp and query
+            timestamp = datetime.now().strftime('%H:%M:%S')
+            parts.append(f"[{timestamp}] Query: {response_data['query']}\n")
+            parts.append(f"Execution Time: {response_data['execution_time']:.3f} seconds\n")
+            parts.append("-" * 60 + "\n")
+            
+            # Add AI response if available
+            if response_data.get('llm_response'):
+                parts.append("AI Response:\n")
+                parts.append(response_data['llm_response'])
+                parts.append("\n")
+            else:
+                parts.append("No AI response generated.\n")
+            
+            parts.append("\n" + "=" * 80 + "\n\n")
+            
+            # O_APPEND places every write at the current end of the file
+            data = memoryview("".join(parts).encode('utf-8'))
+            while data:
+                data = data[os.write(self._daily_fd, data):]
+            self._daily_needs_header = False
             
             return True
             
@@ -322,6 +339,26 @@ Commands:
             logging.error(f"Failed to append to daily file: {e}")
             return False
     
+    def _close_daily_file(self):
+        """Close the open daily results file, if any"""
+        if self._daily_fd is not None:
+            os.close(self._daily_fd)
+            self._daily_fd = None
+            self._daily_path = None
+    
+    def set_sources_preference(self, preference: str):
+        """Set whether document sources are shown: 'on', 'off' or 'ask'"""
+        self._show_sources_pref = preference
+        self.console.print(f"[green]Document sources:[/green] {preference}")
+    
+    def clear_screen(self):
+        """Clear the terminal screen"""
+        # rich writes the ANSI clear sequence directly instead of spawning a process
+        if self.console.is_terminal:
+            self.console.clear()
+        else:
+            os.system('clear' if os.name == 'posix' else 'cls')
+    
     def show_help(self):
         """Display help information"""
         help_text = """
@@ -336,6 +373,7 @@ Commands:
 • history  - View recent query history
 • stats    - Show database statistics  
 • clear    - Clear the screen
+• sources on|off|ask - Show, hide or ask about document sources
 • exit     - Exit the application
 
 [bold]Tips:[/bold]
@@ -374,7 +412,7 @@ Commands:
     
     def show_stats(self):
         """Display database statistics"""
-        stats = self.db_manager.get_database_stats()
+        stats = self._get_database_stats()
         
         stats_text = f"""
 [bold cyan]Database Statistics:[/bold cyan]
@@ -419,8 +457,7 @@ Commands:
                     context
                 )
             
-            self.console.print(table)
-            self.console.print(f"\n[dim]Found {len(results)} document(s) containing the scripture reference[/dim]")
+            self.console.print(table, f"\n[dim]Found {len(results)} document(s) containing the scripture reference[/dim]")
         else:
             self.console.print(f"[yellow]No documents found containing scripture reference: {scripture_ref}[/yellow]")
     
@@ -459,8 +496,11 @@ Commands:
         main_query = parts[0].strip()
         scripture_filter = parts[1].strip()
         
-        self.console.print(f"\n🔍 [bold]Query:[/bold] '{main_query}'")
-        self.console.print(f"📖 [bold]Scripture Filter:[/bold] '{scripture_filter}'")
+        self.console.print(
+            f"\n🔍 [bold]Query:[/bold] '{main_query}'",
+            f"📖 [bold]Scripture Filter:[/bold] '{scripture_filter}'",
+            sep="\n"
+        )
         
         # Use AI if enabled and available
         use_llm = self.use_ai
@@ -485,10 +525,12 @@ Commands:
     
     def display_scripture_filtered_response(self, response: dict):
         """Display scripture-filtered query response"""
+        # Collect everything and print it in one call
+        renderables = []
         
         # Show scripture matches first
         if response.get('scripture_matches'):
-            self.console.print(f"\n[bold green]Scripture Matches[/bold green] ({len(response['scripture_matches'])} found)")
+            renderables.append(f"\n[bold green]Scripture Matches[/bold green] ({len(response['scripture_matches'])} found)")
             
             table = Table(show_header=True, header_style="bold magenta")
             table.add_column("Document", min_width=25)
@@ -506,7 +548,7 @@ Commands:
                     context
                 )
             
-            self.console.print(table)
+            renderables.append(table)
         
         # Show LLM response if available
         if response['llm_response']:
@@ -515,7 +557,10 @@ Commands:
                 title="[bold green]AI Response (Scripture-Filtered)[/bold green]",
                 border_style="green"
             )
-            self.console.print(llm_panel)
+            renderables.append(llm_panel)
+        
+        if renderables:
+            self.console.print(*renderables)
         
     
     def process_concept_query(self, concept: str):
@@ -542,8 +587,7 @@ Commands:
                     context
                 )
             
-            self.console.print(table)
-            self.console.print(f"\n[dim]Found {len(results)} document(s) containing the theological concept[/dim]")
+            self.console.print(table, f"\n[dim]Found {len(results)} document(s) containing the theological concept[/dim]")
         else:
             self.console.print(f"[yellow]No documents found containing theological concept: {concept}[/yellow]")
     
@@ -589,7 +633,7 @@ def main(query, output, no_ai, no_save):
     """
     auto_save = not no_save  # Default is True unless --no-save is specified
     use_ai = not no_ai      # Default is True unless --no-ai is specified
-    interface = TerminalInterface(auto_save=auto_save, use_ai=use_ai)
+    interface = TerminalInterface(auto_save=auto_save, use_ai=use_ai, interactive=not query)
     
     if query:
         # Single query mode
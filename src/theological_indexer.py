@@ -6,33 +6,182 @@ Extracts and indexes theological concepts from documents for efficient retrieval
 import os
 import sqlite3
 import logging
+import threading
 import re
-import yaml
-from typing import Dict, List, Set, Tuple, Optional
-from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from bisect import bisect_right
+from functools import cached_property
+from typing import Dict, Iterable, List, Set, Tuple, Optional
+from collections import Counter, deque
+from itertools import groupby
+from operator import itemgetter
 import json
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; concepts are located by prefix with str.find without it
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional; the json module produces the same encoding
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Pending concept rows flushed to the database at once during bulk indexing
+BULK_INSERT_ROWS = 10000
+
+# Rebuilds of at least this many documents extract concepts in a process pool
+PARALLEL_REBUILD_MIN_DOCUMENTS = 32
+
+# Secondary indexes on the concept table, dropped and recreated around full rebuilds
+_CONCEPT_INDEXES = {
+    # Covers concept searches and statistics without touching the table rows
+    'idx_concept_doc_freq': 'CREATE INDEX IF NOT EXISTS idx_concept_doc_freq ON theological_concept_index (concept, document_id, frequency)',
+    'idx_document_concepts': 'CREATE INDEX IF NOT EXISTS idx_document_concepts ON theological_concept_index (document_id)',
+}
+
+# Triggers keeping theological_fts in sync, dropped during full rebuilds
+_CONCEPT_FTS_TRIGGERS = {
+    'theological_fts_insert': '''
+        CREATE TRIGGER IF NOT EXISTS theological_fts_insert AFTER INSERT ON theological_concept_index BEGIN
+            INSERT INTO theological_fts (rowid, concept) VALUES (new.rowid, new.concept);
+        END
+    ''',
+    'theological_fts_delete': '''
+        CREATE TRIGGER IF NOT EXISTS theological_fts_delete AFTER DELETE ON theological_concept_index BEGIN
+            INSERT INTO theological_fts (theological_fts, rowid, concept) VALUES ('delete', old.rowid, old.concept);
+        END
+    ''',
+    'theological_fts_update': '''
+        CREATE TRIGGER IF NOT EXISTS theological_fts_update AFTER UPDATE ON theological_concept_index BEGIN
+            INSERT INTO theological_fts (theological_fts, rowid, concept) VALUES ('delete', old.rowid, old.concept);
+            INSERT INTO theological_fts (rowid, concept) VALUES (new.rowid, new.concept);
+        END
+    ''',
+}
+
+# Longest unfinished sentence held back for the next chunk when scanning chunk
+# by chunk; longer ones are scanned as they are and may lose context
+MAX_OPEN_SENTENCE_CHARS = 2000
+
+# Leading characters of a concept located with str.find when pyahocorasick is unavailable
+FIND_PREFIX_CHARS = 3
+
+_WORD_CHAR = re.compile(r'\w')
+_SENTENCE_SEPARATOR = re.compile(r'[.!?]+')
+
+# Extraction-only indexer of each rebuild worker process
+_worker_indexer = None
+
+def _dumps_json(value) -> bytes:
+    """Serialize context snippets to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads_json(data):
+    """Deserialize stored context snippets, whether bytes or legacy TEXT"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _init_rebuild_worker():
+    """Create an indexer per worker process without touching the database; concepts load on first use"""
+    global _worker_indexer
+    _worker_indexer = TheologicalIndexer.__new__(TheologicalIndexer)
+
+def _extract_document_concepts(chunks: List[str]) -> Dict[str, Dict]:
+    """Extract theological concepts from a document's chunks in a worker process"""
+    return _worker_indexer.extract_concepts_from_chunks(chunks)
+
+def _submit_extractions(executor: ProcessPoolExecutor, docs: Iterable[Tuple[int, List[str], Optional[str]]],
+                        window: int):
+    """Yield (document_id, future, filename) in order, keeping at most window extractions in flight"""
+    pending = deque()
+    for document_id, chunks, filename in docs:
+        pending.append((document_id, executor.submit(_extract_document_concepts, chunks), filename))
+        if len(pending) >= window:
+            yield pending.popleft()
+    yield from pending
+
+def _sentence_bounds(text: str) -> Tuple[List[int], List[int]]:
+    """Return the start and end offsets of the sentences between [.!?]+ separators"""
+    starts = [0]
+    ends = []
+    for separator in _SENTENCE_SEPARATOR.finditer(text):
+        ends.append(separator.start())
+        starts.append(separator.end())
+    ends.append(len(text))
+    return starts, ends
+
+def _sentence_at(text: str, bounds: Tuple[List[int], List[int]], pos: int) -> str:
+    """Return the stripped sentence of text containing offset pos"""
+    starts, ends = bounds
+    i = bisect_right(starts, pos) - 1
+    return text[starts[i]:ends[i]].strip()
+
 class TheologicalIndexer:
     """Extracts and indexes theological concepts from documents"""
     
     def __init__(self, metadata_db_path: str):
         self.metadata_db_path = metadata_db_path
-        self.theological_concepts = self._load_theological_concepts()
+        self._conn_local = threading.local()
         self._init_theological_index_table()
     
-    def _load_theological_concepts(self) -> Set[str]:
-        """Load theological concepts from YAML configuration file"""
+    # Concepts and the matchers built from them load on first extraction, so
+    # instances that only search the index never parse the concepts file
+    @cached_property
+    def _concept_source(self) -> Tuple[Set[str], Dict]:
+        return self._load_theological_concepts()
+    
+    @property
+    def theological_concepts(self) -> Set[str]:
+        return self._concept_source[0]
+    
+    @property
+    def config(self) -> Dict:
+        return self._concept_source[1]
+    
+    @cached_property
+    def _case_sensitive(self) -> bool:
+        return bool(self.config.get('case_sensitive', False))
+    
+    @cached_property
+    def _concepts_by_key(self) -> Dict[str, Tuple[str, ...]]:
+        return self._group_concepts_by_key()
+    
+    @cached_property
+    def _automaton(self):
+        return self._build_concept_automaton()
+    
+    @cached_property
+    def _concept_buckets(self) -> Dict[str, List[Tuple[str, Tuple[str, ...]]]]:
+        return self._build_concept_buckets()
+    
+    def _load_theological_concepts(self) -> Tuple[Set[str], Dict]:
+        """Load theological concepts and config options, via the JSON cache when that is up to date"""
         try:
             # Look for theological_concepts.yaml in the project root
             config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'theological_concepts.yaml')
             
             if not os.path.exists(config_path):
                 logger.warning(f"Theological concepts config not found at {config_path}, using minimal defaults")
-                return {'god', 'jesus', 'christ', 'lord', 'bible', 'scripture', 'word'}
-            
+                return {'god', 'jesus', 'christ', 'lord', 'bible', 'scripture', 'word'}, {}
+            
+            cache_path = config_path + '.json'
+            try:
+                if os.path.getmtime(cache_path) >= os.path.getmtime(config_path):
+                    with open(cache_path, 'r', encoding='utf-8') as f:
+                        cached = json.load(f)
+                    return set(cached['concepts']), cached['config']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            
+            # Imported here so loading from the JSON cache never pays for PyYAML
+            import yaml
             with open(config_path, 'r', encoding='utf-8') as f:
                 config = yaml.safe_load(f)
             
@@ -44,16 +193,105 @@ class TheologicalIndexer:
                 if isinstance(concepts, list):
                     all_concepts.update(concepts)
             
-            # Store config options for later use
-            self.config = config.get('config', {})
+            # Keep config options for later use
+            options = config.get('config', {})
+            self._write_concepts_cache(cache_path, all_concepts, options)
             
             logger.info(f"Loaded {len(all_concepts)} theological concepts from configuration file")
-            return all_concepts
+            return all_concepts, options
             
         except Exception as e:
             logger.error(f"Failed to load theological concepts from config: {e}")
             # Fallback to minimal set
-            return {'god', 'jesus', 'christ', 'lord', 'bible', 'scripture', 'word'}
+            return {'god', 'jesus', 'christ', 'lord', 'bible', 'scripture', 'word'}, {}
+    
+    def _write_concepts_cache(self, cache_path: str, concepts: Set[str], options: Dict):
+        """Atomically write the parsed concepts as JSON; failures only cost the cache"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'concepts': sorted(concepts), 'config': options}, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def _group_concepts_by_key(self) -> Dict[str, Tuple[str, ...]]:
+        """Group concepts by the key they are searched for; concepts differing only in case share one"""
+        case_sensitive = self._case_sensitive
+        concepts_by_key = {}
+        for concept in self.theological_concepts:
+            if concept:
+                search_concept = concept if case_sensitive else concept.lower()
+                concepts_by_key.setdefault(search_concept, []).append(concept)
+        return {search_concept: tuple(concepts) for search_concept, concepts in concepts_by_key.items()}
+    
+    def _build_concept_automaton(self):
+        """Build an Aho-Corasick automaton matching every concept in one scan.
+        
+        Returns None when pyahocorasick is unavailable, in which case concepts
+        are located by prefix with str.find.
+        """
+        if ahocorasick is None or not self._concepts_by_key:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for search_concept, concepts in self._concepts_by_key.items():
+            automaton.add_word(search_concept, (len(search_concept), search_concept, concepts))
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_concept_buckets(self) -> Dict[str, List[Tuple[str, Tuple[str, ...]]]]:
+        """Bucket concept keys by their leading FIND_PREFIX_CHARS characters"""
+        buckets = {}
+        for search_concept, concepts in self._concepts_by_key.items():
+            buckets.setdefault(search_concept[:FIND_PREFIX_CHARS], []).append((search_concept, concepts))
+        return buckets
+    
+    def _iter_concept_hits(self, search_text: str):
+        """Yield (start, search_concept, concepts) for every occurrence of a concept key.
+        
+        Occurrences of any one key are yielded in text order.
+        """
+        if self._automaton is not None:
+            for end_idx, (length, search_concept, concepts) in self._automaton.iter(search_text):
+                yield end_idx - length + 1, search_concept, concepts
+            return
+        
+        # str.find runs in C and skips long stretches without a candidate, so one
+        # pass per distinct prefix replaces a full regex scan per concept
+        for prefix, bucket in self._concept_buckets.items():
+            pos = search_text.find(prefix)
+            while pos != -1:
+                for search_concept, concepts in bucket:
+                    if search_text.startswith(search_concept, pos):
+                        yield pos, search_concept, concepts
+                pos = search_text.find(prefix, pos + 1)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a metadata database connection tuned for bulk indexing"""
+        conn = sqlite3.connect(self.metadata_db_path)
+        # WAL makes NORMAL sync safe: commits no longer fsync, only checkpoints do
+        conn.executescript('''
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+        ''')
+        return conn
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, opening it on first use.
+        
+        Reusing it keeps SQLite's page cache and the statement cache of
+        sqlite3 warm across searches; it closes when the thread ends.
+        """
+        conn = getattr(self._conn_local, 'conn', None)
+        if conn is None:
+            conn = self._conn_local.conn = self._connect()
+        return conn
     
     def _init_theological_index_table(self):
         """Initialize the theological concept index table"""
@@ -61,6 +299,9 @@ class TheologicalIndexer:
             conn = sqlite3.connect(self.metadata_db_path)
             cursor = conn.cursor()
             
+            # WAL is persistent for the database file, so it only needs setting once
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Create theological concept index table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS theological_concept_index (
@@ -73,16 +314,12 @@ class TheologicalIndexer:
                 )
             ''')
             
-            # Create indexes for performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_concept_lookup 
-                ON theological_concept_index (concept)
-            ''')
+            # Create indexes for performance; idx_concept_doc_freq supersedes idx_concept_lookup
+            cursor.execute('DROP INDEX IF EXISTS idx_concept_lookup')
+            for statement in _CONCEPT_INDEXES.values():
+                cursor.execute(statement)
             
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_document_concepts 
-                ON theological_concept_index (document_id)
-            ''')
+            self._fts_enabled = self._init_concept_fts(cursor)
             
             conn.commit()
             conn.close()
@@ -93,93 +330,215 @@ class TheologicalIndexer:
             logger.error(f"Failed to initialize theological index table: {e}")
             raise
     
+    def _init_concept_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over concepts, returning False when FTS5 is unavailable"""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'theological_fts'")
+            exists = cursor.fetchone() is not None
+            
+            # External-content index: tokens only, rows stay in theological_concept_index
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS theological_fts USING fts5(
+                    concept,
+                    content='theological_concept_index', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            
+            # Keep the index in sync with theological_concept_index
+            for statement in _CONCEPT_FTS_TRIGGERS.values():
+                cursor.execute(statement)
+            
+            # Index concepts stored before the FTS table existed
+            if not exists:
+                cursor.execute("INSERT INTO theological_fts (theological_fts) VALUES ('rebuild')")
+            return True
+            
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, concept search will match concepts exactly: {e}")
+            return False
+    
+    def _fts_query(self, concepts: List[str]) -> Optional[str]:
+        """Build an FTS5 query matching any of the concepts as a phrase"""
+        phrases = []
+        for concept in concepts:
+            tokens = re.findall(r'\w+', concept)
+            if tokens:
+                phrases.append(f'"{" ".join(tokens)}"')
+        return ' OR '.join(phrases) if phrases else None
+    
     def extract_concepts_from_text(self, text: str) -> Dict[str, Dict]:
         """Extract theological concepts from text with context"""
         concept_data = {}
+        self._collect_concepts(text, concept_data)
+        return concept_data
+    
+    def extract_concepts_from_chunks(self, chunks: Iterable[str]) -> Dict[str, Dict]:
+        """Extract theological concepts from a document's chunks as if they were joined by newlines.
         
-        # Get case sensitivity setting from config
-        case_sensitive = self.config.get('case_sensitive', False)
-        search_text = text if case_sensitive else text.lower()
+        Only one chunk and the unfinished sentence before it are held at a time.
+        """
+        concept_data = {}
+        pending = None
+        for chunk in chunks:
+            if not chunk:
+                continue
+            text = chunk if pending is None else f"{pending}\n{chunk}"
+            
+            # The last sentence may continue into the next chunk, so it is held back
+            # and scanned with that chunk to keep its full context
+            cut = max(text.rfind('.'), text.rfind('!'), text.rfind('?')) + 1
+            if len(text) - cut > MAX_OPEN_SENTENCE_CHARS:
+                cut = len(text)
+            if cut:
+                self._collect_concepts(text[:cut], concept_data)
+            pending = text[cut:]
         
-        # Split text into sentences for context extraction
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]  # Remove empty sentences
+        if pending:
+            self._collect_concepts(pending, concept_data)
+        return concept_data
+    
+    def _collect_concepts(self, text: str, concept_data: Dict[str, Dict]):
+        """Add the concepts found in text to concept_data from the occurrences found by _iter_concept_hits"""
+        # Case sensitivity is fixed by the concepts config when it loads
+        search_text = text if self._case_sensitive else text.lower()
         
-        for concept in self.theological_concepts:
-            # Prepare concept for matching based on case sensitivity
-            search_concept = concept if case_sensitive else concept.lower()
-            
-            # Find all occurrences of the concept
-            pattern = r'\b' + re.escape(search_concept) + r'\b'
-            matches = list(re.finditer(pattern, search_text, re.IGNORECASE if not case_sensitive else 0))
-            
-            if matches:
-                frequency = len(matches)
-                context_snippets = []
-                
-                # Extract context for each match by finding sentences that contain the concept
-                for match in matches[:5]:  # Limit to first 5 contexts
-                    start_pos = match.start()
-                    end_pos = match.end()
-                    
-                    # Find the sentence containing this match
-                    for sentence in sentences:
-                        sentence_lower = sentence.lower() if not case_sensitive else sentence
-                        if search_concept in sentence_lower:
-                            # Avoid duplicate context snippets
-                            if sentence.strip() not in context_snippets:
-                                context_snippets.append(sentence.strip())
-                            if len(context_snippets) >= 3:  # Limit to 3 unique contexts
-                                break
-                
-                concept_data[concept] = {
-                    'frequency': frequency,
-                    'context_snippets': context_snippets[:3]  # Keep top 3 contexts
-                }
+        # Match offsets in the lowercased text only map back to sentences of the
+        # original when lowercasing kept every character's length
+        aligned = len(search_text) == len(text)
+        sentence_bounds = None
+        sentences = None
+        last_end = {}
         
-        return concept_data
+        for start, search_concept, concepts in self._iter_concept_hits(search_text):
+            end = start + len(search_concept)
+            
+            # Whole-word matches only: a boundary lies between a word and a
+            # non-word character
+            if start > 0 and bool(_WORD_CHAR.match(search_text[start - 1])) == bool(_WORD_CHAR.match(search_text[start])):
+                continue
+            if end < len(search_text) and bool(_WORD_CHAR.match(search_text[end - 1])) == bool(_WORD_CHAR.match(search_text[end])):
+                continue
+            
+            # Occurrences of one concept do not overlap
+            first = search_concept not in last_end
+            if start < last_end.get(search_concept, 0):
+                continue
+            last_end[search_concept] = end
+            
+            data = concept_data.get(concepts[0])
+            if data is None:
+                data = {'frequency': 0, 'context_snippets': []}
+                for concept in concepts:
+                    concept_data[concept] = data
+            data['frequency'] += 1
+            
+            context_snippets = data['context_snippets']
+            if len(context_snippets) >= 3:  # Limit to 3 unique contexts
+                continue
+            if aligned:
+                if sentence_bounds is None:
+                    sentence_bounds = _sentence_bounds(text)
+                sentence = _sentence_at(text, sentence_bounds, start)
+                if sentence not in context_snippets:
+                    context_snippets.append(sentence)
+            elif first:
+                # Offsets are unusable, so take the first sentences containing the concept
+                if sentences is None:
+                    sentences = [s.strip() for s in _SENTENCE_SEPARATOR.split(text) if s.strip()]
+                    search_sentences = sentences if self._case_sensitive else [s.lower() for s in sentences]
+                for sentence, sentence_lower in zip(sentences, search_sentences):
+                    if len(context_snippets) >= 3:
+                        break
+                    if search_concept in sentence_lower and sentence not in context_snippets:
+                        context_snippets.append(sentence)
     
     def index_document(self, document_id: int, document_content: str, filename: str = None) -> bool:
         """Index a single document for theological concepts"""
+        return self.index_documents_bulk([(document_id, document_content, filename)]) == 1
+    
+    def index_documents_bulk(self, docs: List[Tuple[int, str, Optional[str]]]) -> int:
+        """Index (document_id, content, filename) documents in one transaction, returning the number indexed"""
         try:
-            # Extract concepts from document
-            concepts = self.extract_concepts_from_text(document_content)
+            conn = self._get_conn()
+            try:
+                success_count = self._index_documents(
+                    conn, ((document_id, (content,), filename) for document_id, content, filename in docs)
+                )
+                conn.commit()
+            except Exception:
+                # Leave the shared connection without an open transaction
+                conn.rollback()
+                raise
+            return success_count
             
+        except Exception as e:
+            logger.error(f"Failed to index documents: {e}")
+            return 0
+    
+    def _index_documents(self, conn: sqlite3.Connection, docs: Iterable[Tuple[int, object, Optional[str]]],
+                         replace: bool = True) -> int:
+        """Store the concepts of each (document_id, chunks, filename) document on conn; the caller commits.
+        
+        A document's chunks may instead be a Future of its extracted concepts.
+        With replace=False the documents' existing rows are not deleted first,
+        which is only correct when the table has already been cleared.
+        """
+        success_count = 0
+        pending_ids = []
+        pending_rows = []
+        
+        for document_id, document_content, filename in docs:
             # Use filename for logging if provided, otherwise fall back to document_id
             display_name = filename if filename else f"document {document_id}"
-            
-            if not concepts:
+            try:
+                # Extract concepts from document
+                if isinstance(document_content, Future):
+                    concepts = document_content.result()
+                else:
+                    concepts = self.extract_concepts_from_chunks(document_content)
+            except Exception as e:
+                logger.error(f"Failed to index {display_name}: {e}")
+                continue
+            
+            if concepts:
+                logger.info(f"Indexed {len(concepts)} concepts for {display_name}")
+            else:
                 logger.info(f"No theological concepts found in {display_name}")
-                return True
             
-            # Store in database
-            conn = sqlite3.connect(self.metadata_db_path)
-            cursor = conn.cursor()
+            pending_ids.append(document_id)
+            pending_rows.extend(
+                (concept, document_id, data['frequency'], _dumps_json(data['context_snippets']))
+                for concept, data in concepts.items()
+            )
+            success_count += 1
             
-            # Clear existing concepts for this document
+            if len(pending_rows) >= BULK_INSERT_ROWS:
+                self._flush_concept_rows(conn, pending_ids if replace else [], pending_rows)
+                pending_ids, pending_rows = [], []
+        
+        self._flush_concept_rows(conn, pending_ids if replace else [], pending_rows)
+        return success_count
+    
+    def _flush_concept_rows(self, conn: sqlite3.Connection, document_ids: List[int], rows: List[Tuple]):
+        """Clear the documents' existing concepts and insert their new rows"""
+        cursor = conn.cursor()
+        
+        # Clear existing concepts for these documents, within SQLite's parameter limit
+        for i in range(0, len(document_ids), 500):
+            batch = document_ids[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
             cursor.execute(
-                "DELETE FROM theological_concept_index WHERE document_id = ?",
-                (document_id,)
+                f"DELETE FROM theological_concept_index WHERE document_id IN ({placeholders})",
+                batch
             )
-            
-            # Insert new concepts
-            for concept, data in concepts.items():
-                context_json = json.dumps(data['context_snippets'])
-                cursor.execute('''
-                    INSERT INTO theological_concept_index 
-                    (concept, document_id, frequency, context_snippets)
-                    VALUES (?, ?, ?, ?)
-                ''', (concept, document_id, data['frequency'], context_json))
-            
-            conn.commit()
-            conn.close()
-            
-            logger.info(f"Indexed {len(concepts)} concepts for {display_name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to index {display_name}: {e}")
-            return False
+        
+        # Insert new concepts
+        cursor.executemany('''
+            INSERT OR REPLACE INTO theological_concept_index 
+            (concept, document_id, frequency, context_snippets)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
     
     def search_by_concepts(self, concepts: List[str], min_frequency: int = 1) -> List[Dict]:
         """Search for documents containing specific theological concepts"""
@@ -187,38 +546,69 @@ class TheologicalIndexer:
             if not concepts:
                 return []
                 
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            # Build query for multiple concepts
-            concept_placeholders = ','.join('?' * len(concepts))
-            
-            query = f'''
-                SELECT tci.document_id, d.filename, d.filepath, 
-                       tci.concept, tci.frequency, tci.context_snippets,
-                       COUNT(*) as concept_matches
-                FROM theological_concept_index tci
-                JOIN documents d ON tci.document_id = d.id
-                WHERE tci.concept IN ({concept_placeholders})
-                AND tci.frequency >= ?
-                GROUP BY tci.document_id, d.filename, d.filepath
-                ORDER BY concept_matches DESC, tci.frequency DESC
-            '''
-            
-            cursor.execute(query, concepts + [min_frequency])
+            if self._fts_enabled:
+                # The inverted index narrows the rows to phrase matches, which also
+                # include longer concepts ("Son of God" for "God"); only whole,
+                # case-insensitive concept matches are kept. Concepts differing
+                # only in case share their data, so count them once
+                fts_query = self._fts_query(concepts)
+                if fts_query is None:
+                    return []
+                lowered = sorted({concept.lower() for concept in concepts})
+                concept_placeholders = ','.join('?' * len(lowered))
+                cursor.execute(f'''
+                    SELECT document_id, COUNT(*) as concept_matches, SUM(frequency) as total_frequency
+                    FROM (
+                        SELECT DISTINCT tci.document_id, lower(tci.concept), tci.frequency
+                        FROM theological_fts f
+                        JOIN theological_concept_index tci ON tci.rowid = f.rowid
+                        WHERE theological_fts MATCH ?
+                        AND lower(tci.concept) IN ({concept_placeholders})
+                        AND tci.frequency >= ?
+                    )
+                    GROUP BY document_id
+                    ORDER BY concept_matches DESC, total_frequency DESC
+                ''', [fts_query] + lowered + [min_frequency])
+            else:
+                # Build query for multiple concepts
+                concept_placeholders = ','.join('?' * len(concepts))
+                
+                # Rank documents from idx_concept_doc_freq alone; (concept, document_id)
+                # is the primary key, so each row is one distinct concept match
+                cursor.execute(f'''
+                    SELECT document_id, COUNT(*) as concept_matches, SUM(frequency) as total_frequency
+                    FROM theological_concept_index
+                    WHERE concept IN ({concept_placeholders})
+                    AND frequency >= ?
+                    GROUP BY document_id
+                    ORDER BY concept_matches DESC, total_frequency DESC
+                ''', list(concepts) + [min_frequency])
             results = cursor.fetchall()
-            conn.close()
             
-            # Format results
+            # Resolve filenames for the matched documents only
+            documents = {}
+            doc_ids = [row[0] for row in results]
+            for i in range(0, len(doc_ids), 500):
+                batch = doc_ids[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(f"SELECT id, filename, filepath FROM documents WHERE id IN ({placeholders})", batch)
+                documents.update((row[0], row[1:]) for row in cursor)
+            
+            # Format results, skipping index rows of documents that no longer exist
             formatted_results = []
-            for row in results:
-                formatted_results.append({
-                    'document_id': row[0],
-                    'filename': row[1],
-                    'filepath': row[2],
-                    'concept_matches': row[6],
-                    'total_frequency': row[4]
-                })
+            for document_id, concept_matches, total_frequency in results:
+                if document_id in documents:
+                    filename, filepath = documents[document_id]
+                    formatted_results.append({
+                        'document_id': document_id,
+                        'filename': filename,
+                        'filepath': filepath,
+                        'concept_matches': concept_matches,
+                        'total_frequency': total_frequency
+                    })
             
             return formatted_results
             
@@ -229,7 +619,7 @@ class TheologicalIndexer:
     def get_document_concepts(self, document_id: int) -> List[Dict]:
         """Get all theological concepts for a specific document"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -240,14 +630,13 @@ class TheologicalIndexer:
             ''', (document_id,))
             
             results = cursor.fetchall()
-            conn.close()
             
             concepts = []
             for row in results:
                 concepts.append({
                     'concept': row[0],
                     'frequency': row[1],
-                    'context_snippets': json.loads(row[2]) if row[2] else []
+                    'context_snippets': _loads_json(row[2]) if row[2] else []
                 })
             
             return concepts
@@ -259,7 +648,7 @@ class TheologicalIndexer:
     def get_concept_statistics(self) -> Dict:
         """Get statistics about theological concepts in the database"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             # Total concepts
@@ -280,8 +669,6 @@ class TheologicalIndexer:
             ''')
             top_concepts = cursor.fetchall()
             
-            conn.close()
-            
             return {
                 'total_entries': total_entries,
                 'unique_concepts': unique_concepts,
@@ -295,44 +682,91 @@ class TheologicalIndexer:
             logger.error(f"Failed to get concept statistics: {e}")
             return {}
     
+    def _iter_rebuild_documents(self, cursor: sqlite3.Cursor, documents: List[Tuple], stream: bool = True):
+        """Yield (document_id, chunks, filename) for each document with chunks.
+        
+        All chunks come from one query walking idx_document_chunks_order, and
+        streamed chunks are read lazily from cursor, so each document must be
+        consumed before the next one is requested.
+        """
+        filenames = {doc_id: filename for doc_id, filepath, filename in documents}
+        indexed = set()
+        
+        cursor.execute("SELECT document_id, chunk_text FROM document_chunks ORDER BY document_id, chunk_index")
+        for doc_id, rows in groupby(cursor, key=itemgetter(0)):
+            if doc_id not in filenames:
+                continue
+            indexed.add(doc_id)
+            # Scan the chunks as they stream from the cursor instead of
+            # joining the whole document into one string
+            chunks = (row[1] for row in rows)
+            yield doc_id, (chunks if stream else list(chunks)), filenames[doc_id]
+        
+        for doc_id, filename in filenames.items():
+            if doc_id not in indexed:
+                logger.warning(f"No chunks found for document: {filename}")
+    
     def rebuild_index_for_all_documents(self) -> bool:
         """Rebuild the theological concept index for all documents"""
         try:
-            conn = sqlite3.connect(self.metadata_db_path)
+            # One connection and one transaction for the whole rebuild
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get all documents with filename
             cursor.execute("SELECT id, filepath, filename FROM documents")
             documents = cursor.fetchall()
             
-            success_count = 0
             total_count = len(documents)
             
             logger.info(f"Starting to rebuild index for {total_count} documents...")
             
-            for doc_id, filepath, filename in documents:
-                try:
-                    # Read document content from chunks table
-                    cursor.execute(
-                        "SELECT chunk_text FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
-                        (doc_id,)
-                    )
-                    chunks = cursor.fetchall()
-                    
-                    if chunks:
-                        # Combine all chunks into full document content
-                        content = '\n'.join(chunk[0] for chunk in chunks if chunk[0])
-                        
-                        # Index the document with filename for better logging
-                        if self.index_document(doc_id, content, filename):
-                            success_count += 1
-                    else:
-                        logger.warning(f"No chunks found for document: {filename}")
-                        
-                except Exception as e:
-                    logger.error(f"Failed to process document {filename or doc_id}: {e}")
+            # Bulk load without per-row B-tree maintenance, rebuilding the indexes afterwards
+            for index_name in _CONCEPT_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            if self._fts_enabled:
+                for trigger_name in _CONCEPT_FTS_TRIGGERS:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            
+            # Extraction is CPU-bound pure Python, so large rebuilds spread it over processes
+            workers = os.cpu_count() or 1
+            executor = None
+            if workers >= 2 and total_count >= PARALLEL_REBUILD_MIN_DOCUMENTS:
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_rebuild_worker)
+            
+            try:
+                cursor.execute("DELETE FROM theological_concept_index")
+                
+                # Worker processes need each document's chunks as a list; with a pool,
+                # reading and storing overlap a bounded window of extractions in flight
+                docs = self._iter_rebuild_documents(cursor, documents, stream=executor is None)
+                if executor is not None:
+                    docs = _submit_extractions(executor, docs, workers * 2)
+                
+                success_count = self._index_documents(conn, docs, replace=False)
+                conn.commit()
+                
+            except Exception:
+                # Keep the previous index contents if the load fails part way
+                conn.rollback()
+                raise
+                
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                
+                # Recreate the indexes even when the load failed
+                for statement in _CONCEPT_INDEXES.values():
+                    cursor.execute(statement)
+                if self._fts_enabled:
+                    # One pass over the table instead of an FTS update per inserted row
+                    for statement in _CONCEPT_FTS_TRIGGERS.values():
+                        cursor.execute(statement)
+                    cursor.execute("INSERT INTO theological_fts (theological_fts) VALUES ('rebuild')")
+                cursor.execute("ANALYZE theological_concept_index")
+                conn.commit()
+                conn.close()
             
-            conn.close()
             logger.info(f"Rebuilt index for {success_count}/{total_count} documents")
             return success_count == total_count
             
@@ -0,0 +1,237 @@
+"""
+FAISS Vector Store
+HNSW vector index with the subset of the ChromaDB collection API used by DatabaseManager
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+import numpy as np
+import faiss
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class FAISSVectorStore:
+    """Inner-product HNSW index persisted with faiss.write_index.
+
+    FAISS only stores vectors, so the mapping from FAISS ids to vector ids,
+    chunk text and metadata lives in a SQLite table next to the other metadata.
+    The FAISS id of a vector is the never-reused rowid of its mapping row, so
+    the rows can be written inside the caller's metadata transaction and the
+    vectors added to the index once it has committed. HNSW indexes cannot
+    remove vectors; deleted rows are tombstoned in the mapping table and
+    filtered out of query results.
+    """
+
+    def __init__(self, index_path: str, metadata_db_path: str, hnsw_m: int = 32, ef_search: int = 64):
+        self.index_path = index_path
+        self.metadata_db_path = metadata_db_path
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        self._init_mapping_table()
+
+        self.index = None
+        if os.path.exists(self.index_path):
+            self.index = self._load_index()
+            logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors from {self.index_path}")
+
+    def _init_mapping_table(self):
+        """Initialize the FAISS id mapping table"""
+        conn = sqlite3.connect(self.metadata_db_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS faiss_vectors (
+                    faiss_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    vector_id TEXT UNIQUE NOT NULL,
+                    document TEXT,
+                    metadata TEXT,
+                    deleted INTEGER DEFAULT 0
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _create_index(self, dimension: int):
+        """Create an empty HNSW index for vectors of the given dimension, addressed by FAISS id"""
+        hnsw = faiss.IndexHNSWFlat(dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efSearch = self.ef_search
+        return faiss.IndexIDMap2(hnsw)
+
+    def _load_index(self):
+        """Read the persisted index"""
+        index = faiss.read_index(self.index_path)
+        # efSearch is not persisted with the index
+        faiss.downcast_index(index.index).hnsw.efSearch = self.ef_search
+        return index
+
+    def stage(self, conn: sqlite3.Connection, embeddings: List[List[float]], documents: List[str],
+              ids: List[str], metadatas: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Write mapping rows in the caller's open transaction.
+
+        Returns the (faiss_ids, vectors) to pass to add_staged once the
+        transaction has committed.
+        """
+        conn.executemany('''
+            INSERT OR REPLACE INTO faiss_vectors (vector_id, document, metadata)
+            VALUES (?, ?, ?)
+        ''', [
+            (vector_id, document, json.dumps(metadata))
+            for vector_id, document, metadata in zip(ids, documents, metadatas)
+        ])
+
+        faiss_ids = {}
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            faiss_ids.update(conn.execute(
+                f"SELECT vector_id, faiss_id FROM faiss_vectors WHERE vector_id IN ({placeholders})",
+                batch
+            ).fetchall())
+
+        return (
+            np.array([faiss_ids[vector_id] for vector_id in ids], dtype=np.int64),
+            np.ascontiguousarray(embeddings, dtype=np.float32)
+        )
+
+    def add_staged(self, faiss_ids: np.ndarray, vectors: np.ndarray):
+        """Add vectors whose mapping rows have been committed; flush persists them"""
+        if not len(faiss_ids):
+            return
+        with self._lock:
+            if self.index is None:
+                self.index = self._create_index(vectors.shape[1])
+            self.index.add_with_ids(vectors, faiss_ids)
+            self._dirty = True
+
+    def add(self, embeddings: List[List[float]], documents: List[str], ids: List[str],
+            metadatas: List[Dict[str, Any]]):
+        """Add vectors with their documents and metadata in their own transaction"""
+        conn = sqlite3.connect(self.metadata_db_path, timeout=30.0)
+        try:
+            staged = self.stage(conn, embeddings, documents, ids, metadatas)
+            conn.commit()
+        finally:
+            conn.close()
+        self.add_staged(*staged)
+        self.flush()
+
+    def flush(self):
+        """Write the index to disk if vectors were added since the last flush"""
+        with self._lock:
+            if self._dirty and self.index is not None:
+                faiss.write_index(self.index, self.index_path)
+                self._dirty = False
+
+    def _allowed_faiss_ids(self, conn: sqlite3.Connection, ids: List[str]) -> np.ndarray:
+        """Map vector ids to live FAISS ids"""
+        faiss_ids = []
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(
+                f"SELECT faiss_id FROM faiss_vectors WHERE deleted = 0 AND vector_id IN ({placeholders})",
+                batch
+            ).fetchall()
+            faiss_ids.extend(row[0] for row in rows)
+        return np.array(faiss_ids, dtype=np.int64)
+
+    def query(self, query_embeddings: List[List[float]], n_results: int = 10,
+              ids: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Dict[str, List]:
+        """Search for nearest neighbours, returning results shaped like a Chroma query"""
+        results = {'ids': [], 'documents': [], 'metadatas': [], 'distances': []}
+        if self.index is None or self.index.ntotal == 0:
+            for _ in query_embeddings:
+                for key in results:
+                    results[key].append([])
+            return results
+
+        vectors = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        conn = sqlite3.connect(self.metadata_db_path)
+        try:
+            params = None
+            if ids is not None:
+                selector = faiss.IDSelectorBatch(self._allowed_faiss_ids(conn, ids))
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+
+            # Over-fetch so tombstoned vectors do not shrink the result set
+            with self._lock:
+                k = min(self.index.ntotal, n_results * 2)
+                scores, labels = self.index.search(vectors, k, params=params)
+
+            for row_scores, row_labels in zip(scores, labels):
+                live = [(int(label), float(score)) for label, score in zip(row_labels, row_scores) if label >= 0]
+                mapping = {}
+                if live:
+                    placeholders = ','.join('?' * len(live))
+                    for faiss_id, vector_id, document, metadata in conn.execute(
+                        f'''SELECT faiss_id, vector_id, document, metadata FROM faiss_vectors
+                            WHERE deleted = 0 AND faiss_id IN ({placeholders})''',
+                        [label for label, _ in live]
+                    ):
+                        mapping[faiss_id] = (vector_id, document, json.loads(metadata) if metadata else {})
+
+                hits = [(mapping[label], score) for label, score in live if label in mapping][:n_results]
+                results['ids'].append([hit[0][0] for hit in hits])
+                results['documents'].append([hit[0][1] for hit in hits])
+                results['metadatas'].append([hit[0][2] for hit in hits])
+                # Match Chroma's ip space, which reports 1 - dot product
+                results['distances'].append([1 - hit[1] for hit in hits])
+        finally:
+            conn.close()
+
+        return results
+
+    def count(self) -> int:
+        """Return the number of live vectors"""
+        conn = sqlite3.connect(self.metadata_db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM faiss_vectors WHERE deleted = 0").fetchone()[0]
+        finally:
+            conn.close()
+
+    def get(self, ids: Optional[List[str]] = None) -> Dict[str, List]:
+        """Return stored ids, documents and metadata, optionally restricted to ids"""
+        conn = sqlite3.connect(self.metadata_db_path)
+        try:
+            if ids is None:
+                rows = conn.execute(
+                    "SELECT vector_id, document, metadata FROM faiss_vectors WHERE deleted = 0 ORDER BY faiss_id"
+                ).fetchall()
+            else:
+                placeholders = ','.join('?' * len(ids))
+                rows = conn.execute(
+                    f'''SELECT vector_id, document, metadata FROM faiss_vectors
+                        WHERE deleted = 0 AND vector_id IN ({placeholders}) ORDER BY faiss_id''',
+                    ids
+                ).fetchall() if ids else []
+        finally:
+            conn.close()
+
+        return {
+            'ids': [row[0] for row in rows],
+            'documents': [row[1] for row in rows],
+            'metadatas': [json.loads(row[2]) if row[2] else {} for row in rows]
+        }
+
+    def delete(self, ids: List[str]):
+        """Tombstone vectors so they are no longer returned"""
+        if not ids:
+            return
+
+        conn = sqlite3.connect(self.metadata_db_path, timeout=30.0)
+        try:
+            conn.executemany(
+                "UPDATE faiss_vectors SET deleted = 1 WHERE vector_id = ?",
+                [(vector_id,) for vector_id in ids]
+            )
+            conn.commit()
+        finally:
+            conn.close()
@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.initialize_database import initialize_database
 from src.query_engine import QueryEngine
+from src.passage_extraction import extract_full_content
 from src.document_processor import DocumentProcessor
 from src.database_config import get_database_config, DatabaseConfig
 
@@ -37,13 +38,17 @@ query_engine = None
 document_processor = None
 config = None
 
+# Derived from config once in initialize_app instead of on every request
+OUTPUT_FOLDER = None
+DB_INFO = None
+
 # Default settings (can be overridden via API)
 USE_AI_DEFAULT = True
 AUTO_SAVE_DEFAULT = True
 
 def initialize_app(db_id=None):
     """Initialize the application components with multi-database support"""
-    global db_manager, query_engine, document_processor, config
+    global db_manager, query_engine, document_processor, config, OUTPUT_FOLDER, DB_INFO
     
     try:
         # Get database-specific configuration
@@ -58,6 +63,14 @@ def initialize_app(db_id=None):
         query_engine = QueryEngine(config, db_manager)
         document_processor = DocumentProcessor(config, db_manager)
         
+        OUTPUT_FOLDER = Path(config['output']['default_output_folder'])
+        DB_INFO = {
+            'database_id': config['database']['database_id'],
+            'database_name': config['database']['database_name'],
+            'database_description': config['database']['database_description'],
+            'document_folder': config['document_processing']['input_folder']
+        }
+        
         print("✓ Web application initialized successfully")
         return resolved_db_id
                 
@@ -125,10 +138,7 @@ def get_database_info():
         return jsonify({
             'success': True,
             'data': {
-                'database_id': config['database']['database_id'],
-                'database_name': config['database']['database_name'],
-                'database_description': config['database']['database_description'],
-                'document_folder': config['document_processing']['input_folder'],
+                **DB_INFO,
                 'stats': db_manager.get_database_stats() if db_manager else None
             }
         })
@@ -188,7 +198,7 @@ def export_results():
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"query_export_{timestamp}.{format_type}"
-        output_path = Path(config['output']['default_output_folder']) / filename
+        output_path = OUTPUT_FOLDER / filename
         
         # Export results
         success = query_engine.export_query_results(query_data, str(output_path), format_type)
@@ -396,81 +406,14 @@ def handle_query_stream(data):
         emit('query_error', {'error': str(e)})
 
 def _extract_full_content(content: str, query: str) -> str:
-    """Extract full sentences or paragraphs containing the query context (same as terminal)"""
-    import re
-    
-    # First try to split by paragraphs (double newlines)
-    paragraphs = re.split(r'\n\s*\n', content)
-    paragraphs = [p.strip() for p in paragraphs if p.strip()]
-    
-    # Find paragraphs containing query terms
-    query_words = [word.lower() for word in query.split() if len(word) > 2]  # Skip short words
-    relevant_paragraphs = []
-    
-    for paragraph in paragraphs:
-        paragraph_lower = paragraph.lower()
-        # Count how many query words are in this paragraph
-        word_matches = sum(1 for word in query_words if word in paragraph_lower)
-        if word_matches > 0:
-            relevant_paragraphs.append((paragraph, word_matches))
-    
-    if relevant_paragraphs:
-        # Sort by number of matching words and take the best
-        relevant_paragraphs.sort(key=lambda x: x[1], reverse=True)
-        best_paragraph = relevant_paragraphs[0][0]
-        
-        # If paragraph is reasonable length, return it as is
-        if len(best_paragraph) <= 500:
-            return best_paragraph
-        else:
-            # If too long, try to extract relevant sentences from the paragraph
-            sentences = re.split(r'[.!?]+', best_paragraph)
-            sentences = [s.strip() for s in sentences if s.strip()]
-            
-            relevant_sentences = []
-            for sentence in sentences:
-                sentence_lower = sentence.lower()
-                word_matches = sum(1 for word in query_words if word in sentence_lower)
-                if word_matches > 0:
-                    relevant_sentences.append((sentence, word_matches))
-            
-            if relevant_sentences:
-                # Take the top 2-3 most relevant sentences
-                relevant_sentences.sort(key=lambda x: x[1], reverse=True)
-                top_sentences = [s[0] for s in relevant_sentences[:3]]
-                return '. '.join(top_sentences) + '.'
-            else:
-                # Fallback to first part of paragraph
-                return best_paragraph[:400] + "..."
-    
-    # If no paragraphs match, try sentences from the whole content
-    sentences = re.split(r'[.!?]+', content)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    relevant_sentences = []
-    for sentence in sentences:
-        sentence_lower = sentence.lower()
-        word_matches = sum(1 for word in query_words if word in sentence_lower)
-        if word_matches > 0:
-            relevant_sentences.append((sentence, word_matches))
-    
-    if relevant_sentences:
-        # Sort by relevance and take top sentences
-        relevant_sentences.sort(key=lambda x: x[1], reverse=True)
-        top_sentences = [s[0] for s in relevant_sentences[:2]]
-        return '. '.join(top_sentences) + '.'
-    
-    # Fallback to beginning of content
-    if len(content) <= 300:
-        return content
-    else:
-        return content[:300] + "..."
+    """Extract full sentences or paragraphs containing the query context"""
+    return extract_full_content(content, query)
 
 def _auto_save_results(response_data: dict) -> str:
     """Auto-save query results to daily file and return filename"""
     date_str = datetime.now().strftime("%Y-%m-%d")
     filename = f"web_queries_{date_str}.txt"
-    output_path = Path(config['output']['default_output_folder']) / filename
+    output_path = OUTPUT_FOLDER / filename
     
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -6,13 +6,70 @@ Start the web interface with interactive database selection
 
 import os
 import sys
+import logging
 import argparse
-
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import subprocess
+from contextlib import contextmanager
 
 from src.database_config import DatabaseConfig
-from src.web_app import initialize_app, app, socketio
+
+# Import trace written by --profile-startup, and how many imports it summarizes
+STARTUP_PROFILE_FILE = 'startup_importtime.log'
+STARTUP_PROFILE_TOP = 20
+
+def _silence_flask():
+    """Disable all logging before the server starts"""
+    # Drops records of every level from every logger, Flask and SocketIO included
+    logging.disable(logging.CRITICAL)
+    
+    # Nothing reaches the root handlers, even if a library lowers the disable level
+    logging.root.handlers[:] = [logging.NullHandler()]
+
+@contextmanager
+def _output_to_devnull():
+    """Point file descriptors 1 and 2 at os.devnull, restoring them on exit"""
+    # Redirecting the descriptors also silences writes that bypass sys.stdout
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = (os.dup(1), os.dup(2))
+    devnull_fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull_fd, 1)
+        os.dup2(devnull_fd, 2)
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in (devnull_fd,) + saved_fds:
+            os.close(fd)
+
+def _profile_startup(argv: list) -> int:
+    """Run start_web.py under -X importtime, then print its slowest imports"""
+    print(f"⏱️  Tracing imports to {STARTUP_PROFILE_FILE}", flush=True)
+    with open(STARTUP_PROFILE_FILE, 'w') as trace:
+        try:
+            returncode = subprocess.call(
+                [sys.executable, '-X', 'importtime', os.path.abspath(__file__)] + argv,
+                stderr=trace
+            )
+        except KeyboardInterrupt:
+            returncode = 0
+    
+    # Trace lines read "import time: <self us> | <cumulative us> | <module>"
+    imports = []
+    with open(STARTUP_PROFILE_FILE, 'r') as trace:
+        for line in trace:
+            fields = line[len('import time:'):].split('|')
+            if line.startswith('import time:') and len(fields) == 3 and fields[0].strip().isdigit():
+                imports.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+    
+    print(f"\n🐢 Slowest imports by self time (total {sum(i[0] for i in imports) / 1e6:.2f}s):")
+    print(f"{'self ms':>10} {'cumulative ms':>14}  module")
+    for self_us, cumulative_us, module in sorted(imports, reverse=True)[:STARTUP_PROFILE_TOP]:
+        print(f"{self_us / 1000:10.1f} {cumulative_us / 1000:14.1f}  {module}")
+    return returncode
 
 def show_database_menu():
     """Display interactive database selection menu"""
@@ -26,21 +83,22 @@ def show_database_menu():
             print("💡 Use 'manage_databases.py add' to create databases")
             return None
         
-        print("\n🗄️  Available Databases:")
-        print("=" * 60)
+        # Build the whole menu and write it to the terminal at once
+        menu = ["\n🗄️  Available Databases:", "=" * 60]
         
         # Display databases with numbering
         db_list = list(databases.keys())
         for i, db_id in enumerate(db_list, 1):
             db_info = databases[db_id]
             default_marker = " [DEFAULT]" if db_id == default_db_id else ""
-            print(f"{i:2}. {db_id}{default_marker}: {db_info['name']}")
-            print(f"    📖 {db_info['description'][:80]}{'...' if len(db_info['description']) > 80 else ''}")
-            print()
+            menu.append(f"{i:2}. {db_id}{default_marker}: {db_info['name']}")
+            menu.append(f"    📖 {db_info['description'][:80]}{'...' if len(db_info['description']) > 80 else ''}")
+            menu.append("")
         
-        print(f"{len(db_list) + 1:2}. Use default database ({default_db_id}: {databases[default_db_id]['name']})")
-        print(f"{len(db_list) + 2:2}. Exit")
-        print("=" * 60)
+        menu.append(f"{len(db_list) + 1:2}. Use default database ({default_db_id}: {databases[default_db_id]['name']})")
+        menu.append(f"{len(db_list) + 2:2}. Exit")
+        menu.append("=" * 60)
+        print("\n".join(menu))
         
         while True:
             try:
@@ -74,8 +132,8 @@ def show_database_menu():
         print(f"❌ Error loading databases: {e}")
         return None
 
-def main():
-    """Main entry point with interactive database selection"""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser; needs nothing from the web application"""
     parser = argparse.ArgumentParser(description='Start the Document Database Web Interface')
     
     # Add database selection arguments (keeping for backward compatibility)
@@ -88,20 +146,29 @@ def main():
     parser.add_argument('--host', default=None, help='Host to bind to (overrides config)')
     parser.add_argument('--port', type=int, default=None, help='Port to bind to (overrides config)')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--profile-startup', action='store_true',
+                       help=f'Trace import times to {STARTUP_PROFILE_FILE} and list the slowest imports')
+    return parser
+
+def main():
+    """Main entry point with interactive database selection"""
+    # --help exits here, and --list-databases returns below, before src.web_app is imported
+    args = _build_parser().parse_args()
     
-    args = parser.parse_args()
+    if args.profile_startup:
+        return _profile_startup([arg for arg in sys.argv[1:] if arg != '--profile-startup'])
     
     # Handle list databases option
     if args.list_databases:
         try:
             db_config = DatabaseConfig()
-            print("📂 Available Databases:")
-            print("=" * 50)
-            for db_id in db_config.list_database_ids():
-                db_info = db_config.get_database_info(db_id)
-                default_marker = " [DEFAULT]" if db_id == db_config.get_default_database_id() else ""
-                print(f"🔹 {db_id}{default_marker}: {db_info['name']}")
-                print(f"   {db_info['description'][:100]}{'...' if len(db_info['description']) > 100 else ''}")
+            default_db_id = db_config.get_default_database_id()
+            listing = ["📂 Available Databases:", "=" * 50]
+            for db_id, db_info in db_config.registry.get('databases', {}).items():
+                default_marker = " [DEFAULT]" if db_id == default_db_id else ""
+                listing.append(f"🔹 {db_id}{default_marker}: {db_info['name']}")
+                listing.append(f"   {db_info['description'][:100]}{'...' if len(db_info['description']) > 100 else ''}")
+            print("\n".join(listing))
             return 0
         except Exception as e:
             print(f"❌ Error listing databases: {e}")
@@ -119,6 +186,8 @@ def main():
             return 0  # User chose to exit
     
     try:
+        from src.web_app import initialize_app, app, socketio
+        
         # Initialize app with selected database
         db_id = initialize_app(requested_db_id)
         
@@ -131,28 +200,14 @@ def main():
         debug = args.debug or config['web']['debug']
         
         # Suppress ALL Flask output before printing anything
-        import logging
-        import sys
-        import os
-        from contextlib import redirect_stdout, redirect_stderr
-        
-        # Completely disable all logging
-        logging.disable(logging.CRITICAL)
-        
-        # Suppress all Flask-related loggers  
-        for logger_name in ['werkzeug', 'flask', 'flask.app', 'socketio', 'engineio', 'urllib3']:
-            logger = logging.getLogger(logger_name)
-            logger.setLevel(logging.CRITICAL)
-            logger.disabled = True
-            logger.propagate = False
+        _silence_flask()
         
         print(f"🌐 Web interface started: http://{host}:{port}")
         
         # Redirect both stdout and stderr to suppress ALL Flask messages
-        with open(os.devnull, 'w') as devnull:
-            with redirect_stdout(devnull), redirect_stderr(devnull):
-                # Start the web application with all output suppressed
-                socketio.run(app, host=host, port=port, debug=False, log_output=False, use_reloader=False, allow_unsafe_werkzeug=True)
+        with _output_to_devnull():
+            # Start the web application with all output suppressed
+            socketio.run(app, host=host, port=port, debug=False, log_output=False, use_reloader=False, allow_unsafe_werkzeug=True)
         
     except KeyboardInterrupt:
         print("\n👋 Web server stopped")
@@ -4,12 +4,6 @@ Test script for database initialization
 """
 
 import sys
-import os
-import yaml
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent))
 
 def test_database_init():
     """Test database initialization"""
@@ -17,8 +11,8 @@ def test_database_init():
     
     try:
         # Load config
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        from src.database_config import load_yaml_config
+        config = load_yaml_config('config.yaml')
         
         print("✓ Configuration loaded successfully")
         
@@ -4,11 +4,6 @@ Simple test for Ollama integration
 """
 
 import sys
-import yaml
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent))
 
 def test_ollama():
     """Test Ollama integration"""
@@ -16,8 +11,8 @@ def test_ollama():
     
     try:
         # Load config
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        from src.database_config import load_yaml_config
+        config = load_yaml_config('config.yaml')
         
         print("✓ Configuration loaded successfully")
         
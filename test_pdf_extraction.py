@@ -4,39 +4,51 @@ import pdfplumber
 import sys
 import traceback
 
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # optional; pdfplumber extracts every page without it
+    fitz = None
+
+def _extract_page_texts(file_path):
+    """Return the text of every page, with the extractor DocumentProcessor prefers"""
+    if fitz is not None:
+        # MuPDF extracts plain text far faster than pdfminer
+        with fitz.open(file_path) as doc:
+            return [page.get_text("text") for page in doc], "PyMuPDF"
+    with pdfplumber.open(file_path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages], "pdfplumber"
+
 def test_pdf_extraction(file_path):
     """Test PDF text extraction for debugging"""
     print(f"Testing PDF extraction for: {file_path}")
     
     try:
-        with pdfplumber.open(file_path) as pdf:
-            print(f"Number of pages: {len(pdf.pages)}")
-            
-            total_text = ""
-            for i, page in enumerate(pdf.pages):
-                page_text = page.extract_text() or ""
-                total_text += page_text
-                print(f"Page {i+1}: {len(page_text)} characters")
-                
-                # Show first 100 chars of each page as sample
-                if page_text.strip():
-                    sample = page_text.strip()[:100].replace('\n', ' ')
-                    print(f"  Sample: {sample}...")
-                else:
-                    print(f"  Sample: [NO TEXT EXTRACTED]")
-            
-            print(f"\nTotal extracted text: {len(total_text)} characters")
-            print(f"Has meaningful content: {bool(total_text.strip())}")
+        page_texts, extractor = _extract_page_texts(file_path)
+        print(f"Number of pages: {len(page_texts)} (extracted with {extractor})")
+        
+        for i, page_text in enumerate(page_texts):
+            print(f"Page {i+1}: {len(page_text)} characters")
             
-            if total_text.strip():
-                # Show first 200 characters
-                sample = total_text.strip()[:200].replace('\n', ' ')
-                print(f"First 200 chars: {sample}...")
-                return True
+            # Show first 100 chars of each page as sample
+            if page_text.strip():
+                sample = page_text.strip()[:100].replace('\n', ' ')
+                print(f"  Sample: {sample}...")
             else:
-                print("ERROR: No text could be extracted from this PDF")
-                return False
-                
+                print(f"  Sample: [NO TEXT EXTRACTED]")
+        
+        total_text = ''.join(page_texts)
+        print(f"\nTotal extracted text: {len(total_text)} characters")
+        print(f"Has meaningful content: {bool(total_text.strip())}")
+        
+        if total_text.strip():
+            # Show first 200 characters
+            sample = total_text.strip()[:200].replace('\n', ' ')
+            print(f"First 200 chars: {sample}...")
+            return True
+        else:
+            print("ERROR: No text could be extracted from this PDF")
+            return False
+            
     except Exception as e:
         print(f"ERROR extracting from PDF: {e}")
         traceback.print_exc()
@@ -4,12 +4,6 @@ Test Document Preprocessing
 Tests the document preprocessor with various scripture reference formats
 """
 
-import sys
-import os
-
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.document_preprocessor import DocumentPreprocessor
 
 def test_preprocessing():
@@ -57,5 +51,17 @@ def test_preprocessing():
     processed_theological = preprocessor.preprocess_document(theological_test)
     print(processed_theological)
 
+def test_case_folded_book_names():
+    """Book abbreviations with long s or dotted capital I expand like their ASCII forms"""
+    preprocessor = DocumentPreprocessor()
+    
+    assert preprocessor.normalize_scripture_references('ſos 2:3 here') == 'Song of Solomon 2:3 here'
+    assert preprocessor.normalize_scripture_references('İsa 1:1') == 'Isaiah 1:1'
+    
+    # The fused book-name and term scan used by preprocess_document
+    assert preprocessor.preprocess_document('ſos 2:3 here') == 'Song of Solomon 2:3 here'
+    assert preprocessor.preprocess_document('İsa 1:1') == 'Isaiah 1:1'
+
 if __name__ == "__main__":
     test_preprocessing()
+    test_case_folded_book_names()
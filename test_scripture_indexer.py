@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test scripture reference extraction
+Covers verse lists followed by a reference to a numbered book
+"""
+
+import os
+import tempfile
+
+from src.scripture_indexer import ScriptureIndexer
+
+def _extract(text):
+    """Extract references with both the Hyperscan and the plain regex scan"""
+    with tempfile.TemporaryDirectory() as directory:
+        indexer = ScriptureIndexer(os.path.join(directory, 'metadata.db'))
+        results = [indexer.extract_scripture_references(text)]
+        indexer._hyperscan_db = None
+        results.append(indexer.extract_scripture_references(text))
+    return results
+
+def test_verse_list_before_numbered_book():
+    """A verse list stops before the ordinal of the next reference"""
+    for references in _extract('(John 3:16, 1 Corinthians 13:4)'):
+        assert set(references) == {'John 3:16', '1 Corinthians 13:4'}, references
+
+    for references in _extract('Romans 8:28, 2 Timothy 3:16'):
+        assert set(references) == {'Romans 8:28', '2 Timothy 3:16'}, references
+
+def test_space_separated_verse_before_numbered_book():
+    """A chapter number is not paired with the ordinal of the next reference"""
+    for references in _extract('i joh. 4 1 Thessalonians 3:16'):
+        assert '1 Thessalonians 3:16' in references, references
+        assert '1 John 4:1' not in references, references
+
+def test_verse_list_is_kept():
+    """Verse lists without a following book still match whole"""
+    for references in _extract('Romans 8:28, 29, 30 and John 3:16, 17 is love'):
+        assert set(references) == {'Romans 8:28, 29, 30', 'John 3:16, 17'}, references
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the FAISS vector store
+Covers writes inside the caller's transaction, rollback, persistence and filtering
+"""
+
+import os
+import sqlite3
+import tempfile
+import numpy as np
+
+from src.vector_store import FAISSVectorStore
+
+DIMENSION = 8
+
+def _make_store(directory):
+    return FAISSVectorStore(os.path.join(directory, 'vectors', 'faiss.index'),
+                            os.path.join(directory, 'metadata.db'))
+
+def _vectors(count, seed=0):
+    vectors = np.random.default_rng(seed).random((count, DIMENSION), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _records(vectors, prefix):
+    ids = [f"{prefix}_{i}" for i in range(len(vectors))]
+    return dict(embeddings=vectors.tolist(), documents=[f"text {vector_id}" for vector_id in ids],
+                ids=ids, metadatas=[{'n': i} for i in range(len(vectors))])
+
+def test_stage_inside_open_transaction():
+    """Rows are written on the caller's connection, vectors added only after commit"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = _make_store(directory)
+        vectors = _vectors(5)
+
+        conn = sqlite3.connect(store.metadata_db_path, timeout=1.0)
+        conn.execute("CREATE TABLE documents (id INTEGER PRIMARY KEY)")
+        conn.execute("INSERT INTO documents DEFAULT VALUES")
+        staged = store.stage(conn, **_records(vectors, 'doc_1'))
+        assert store.index is None
+        conn.commit()
+        conn.close()
+
+        store.add_staged(*staged)
+        assert not os.path.exists(store.index_path)
+        store.flush()
+
+        results = store.query([vectors[3].tolist()], n_results=1)
+        assert results['ids'] == [['doc_1_3']]
+        assert results['metadatas'] == [[{'n': 3}]]
+        assert store.count() == 5
+
+def test_rolled_back_rows_are_not_indexed():
+    """A rolled back transaction leaves neither rows nor vectors behind"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = _make_store(directory)
+
+        conn = sqlite3.connect(store.metadata_db_path)
+        store.stage(conn, **_records(_vectors(3), 'lost'))
+        conn.rollback()
+        conn.close()
+
+        vectors = _vectors(3, seed=1)
+        store.add(**_records(vectors, 'kept'))
+        assert store.count() == 3
+        assert store.query([vectors[0].tolist()], n_results=3)['ids'][0][0] == 'kept_0'
+
+def test_flushed_index_reloads():
+    """A flushed index is found again by a new store"""
+    with tempfile.TemporaryDirectory() as directory:
+        vectors = _vectors(4)
+        _make_store(directory).add(**_records(vectors, 'doc'))
+
+        reloaded = _make_store(directory)
+        assert reloaded.index.ntotal == 4
+        assert reloaded.query([vectors[2].tolist()], n_results=1)['ids'] == [['doc_2']]
+
+def test_filter_and_delete():
+    """Queries honour the id filter and skip tombstoned vectors"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = _make_store(directory)
+        vectors = _vectors(6)
+        store.add(**_records(vectors, 'doc'))
+
+        filtered = store.query([vectors[0].tolist()], n_results=2, ids=['doc_4', 'doc_5'])
+        assert set(filtered['ids'][0]) == {'doc_4', 'doc_5'}
+
+        store.delete(['doc_0'])
+        assert 'doc_0' not in store.query([vectors[0].tolist()], n_results=3)['ids'][0]
+        assert store.count() == 5
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✓ {name}")